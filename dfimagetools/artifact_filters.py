@@ -1,15 +1,167 @@
 # -*- coding: utf-8 -*-
 """Helper for filtering based on artifact definitions."""
 
+import collections
 import logging
+import re
 
 from artifacts import definitions as artifacts_definitions
 
 from dfvfs.helpers import file_system_searcher as dfvfs_file_system_searcher
+from dfvfs.lib import glob2regex as dfvfs_glob2regex
 
 from dfimagetools import path_resolver
 
 
+# The artifact definition source type indicators are looked up once, instead
+# of once per source.
+_TYPE_INDICATOR_ARTIFACT_GROUP = (
+    artifacts_definitions.TYPE_INDICATOR_ARTIFACT_GROUP)
+_TYPE_INDICATOR_DIRECTORY = artifacts_definitions.TYPE_INDICATOR_DIRECTORY
+_TYPE_INDICATOR_FILE = artifacts_definitions.TYPE_INDICATOR_FILE
+_TYPE_INDICATOR_PATH = artifacts_definitions.TYPE_INDICATOR_PATH
+
+_FILE_SOURCE_TYPE_INDICATORS = frozenset([
+    _TYPE_INDICATOR_DIRECTORY, _TYPE_INDICATOR_FILE, _TYPE_INDICATOR_PATH])
+
+
+class GlobSet(object):
+  """Set of path globs that is matched as a single regular expression.
+
+  The path segments of the path globs are converted into regular expressions
+  in the same way as the dfVFS find specifications do. Matching a path
+  against the glob set costs a single regular expression match regardless of
+  the number of path globs.
+  """
+
+  def __init__(self, path_globs, case_sensitive=False):
+    """Initializes a glob set.
+
+    Path globs that cannot be converted into a regular expression are skipped.
+
+    Args:
+      path_globs (list[tuple[str, str]]): path globs and their corresponding
+          path segment separators.
+      case_sensitive (Optional[bool]): True if the path globs should be
+          matched case sensitive.
+    """
+    super(GlobSet, self).__init__()
+    self._path_globs = list(path_globs)
+
+    flags = re.DOTALL
+    if not case_sensitive:
+      flags |= re.IGNORECASE
+
+    expressions = []
+    for index, (path_glob, path_separator) in enumerate(self._path_globs):
+      try:
+        expression = '/'.join([
+            self._ConvertPathSegmentGlobToRegex(path_segment)
+            for path_segment in path_glob.split(path_separator)])
+
+        re.compile(expression, flags)
+
+      except (ValueError, re.error) as exception:
+        logging.warning((
+            f'Unable to convert path glob: "{path_glob:s}" into regular '
+            f'expression with error: {exception!s}'))
+        continue
+
+      # The name of the group contains the index of the path glob.
+      expressions.append(f'(?P<g{index:d}>{expression:s})')
+
+    self._regex = None
+    if expressions:
+      self._regex = re.compile('|'.join(expressions), flags)
+
+  @property
+  def path_globs(self):
+    """list[tuple[str, str]]: path globs and path segment separators."""
+    return self._path_globs
+
+  def _ConvertPathSegmentGlobToRegex(self, path_segment):
+    """Converts a path segment glob into a regular expression.
+
+    The regular expression of dfVFS glob2regex is used, where the wildcards
+    are changed to not match the "/" path segment separator.
+
+    Args:
+      path_segment (str): path segment glob.
+
+    Returns:
+      str: regular expression of the path segment glob.
+
+    Raises:
+      ValueError: if the path segment glob cannot be converted.
+    """
+    # An empty path segment, such as the one before the leading path segment
+    # separator, only matches an empty path segment.
+    if not path_segment:
+      return ''
+
+    expression = dfvfs_glob2regex.Glob2Regex(path_segment)
+
+    expression_parts = []
+
+    index = 0
+    expression_length = len(expression)
+    while index < expression_length:
+      character = expression[index]
+
+      if character == '\\':
+        expression_parts.append(expression[index:index + 2])
+        index += 2
+
+      elif character == '.':
+        expression_parts.append('[^/]')
+        index += 1
+
+      elif character == '[':
+        end_index = index + 1
+        is_negated = expression[end_index] == '^'
+        if is_negated:
+          end_index += 1
+        if expression[end_index] == ']':
+          end_index += 1
+
+        while expression[end_index] != ']':
+          if expression[end_index] == '\\':
+            end_index += 1
+          end_index += 1
+
+        if is_negated:
+          expression_parts.extend([expression[index:end_index], '/]'])
+        else:
+          expression_parts.append(expression[index:end_index + 1])
+
+        index = end_index + 1
+
+      else:
+        expression_parts.append(character)
+        index += 1
+
+    return ''.join(expression_parts)
+
+  def MatchPath(self, path):
+    """Matches a path against the path globs in the set.
+
+    Args:
+      path (str): path, with "/" as path segment separator.
+
+    Returns:
+      int: index of the first path glob that matches the path or None if no
+          path glob matches.
+    """
+    if not self._regex:
+      return None
+
+    match = self._regex.fullmatch(path)
+    if not match:
+      return None
+
+    return int(match.lastgroup[1:], 10)
+
+
 class ArtifactDefinitionFiltersGenerator(object):
   """Generator of filters based on artifact definitions."""
 
@@ -29,16 +181,21 @@ class ArtifactDefinitionFiltersGenerator(object):
     """
     super(ArtifactDefinitionFiltersGenerator, self).__init__()
     self._artifacts_registry = artifacts_registry
+    self._definitions_cache = {}
     self._environment_variables = environment_variables
+    self._expanded_paths_cache = {}
+    self._expansion_context = None
+    self._glob_sets_cache = {}
     self._path_resolver = path_resolver.PathResolver()
+    self._source_values_cache = {}
     self._user_accounts = user_accounts
 
-  def _BuildFindSpecsFromArtifactDefinition(
-      self, name, environment_variables=None, user_accounts=None):
-    """Builds find specifications from an artifact definition.
+  def _BuildFindSpecsFromArtifactDefinitions(
+      self, names, environment_variables=None, user_accounts=None):
+    """Builds find specifications from artifact definitions.
 
     Args:
-      name (str): name of the artifact definition.
+      names (list[str]): names of the artifact definitions.
       environment_variables (Optional[list[EnvironmentVariable]]): environment
           variables.
       user_accounts (Optional[list[UserAccount]]): user accounts.
@@ -46,82 +203,233 @@ class ArtifactDefinitionFiltersGenerator(object):
     Yields:
       dfvfs.FindSpec: file system (dfVFS) find specification.
     """
+    for path, path_separator in self._GetPathGlobsFromArtifactDefinitions(
+        names, environment_variables=environment_variables,
+        user_accounts=user_accounts):
+      try:
+        find_spec = dfvfs_file_system_searcher.FindSpec(
+            case_sensitive=False, location_glob=path,
+            location_separator=path_separator)
+      except ValueError as exception:
+        logging.error((
+            f'Unable to build find specification for path: "{path:s}" with '
+            f'error: {exception!s}'))
+        continue
+
+      yield find_spec
+
+  def _ExpandFileSourcePath(
+      self, source_path, path_separator, environment_variables=None,
+      user_accounts=None):
+    """Expands a path of a file source type.
+
+    The expanded paths are cached per source path for as long as the
+    expansion context, that is reset by _ResetCachesOnContextChange, does not
+    change.
+
+    Args:
+      source_path (str): file system path defined by the source.
+      path_separator (str): file system path segment separator.
+      environment_variables (Optional[list[EnvironmentVariable]]): environment
+          variables.
+      user_accounts (Optional[list[UserAccount]]): user accounts.
+
+    Returns:
+      list[str]: expanded path globs.
+    """
+    lookup_key = (source_path, path_separator)
+    expanded_paths = self._expanded_paths_cache.get(lookup_key, None)
+    if expanded_paths is not None:
+      return expanded_paths
+
+    expanded_paths = []
+
+    # Brace, globstar and user directory expansion cannot introduce a "%",
+    # hence only a source path that contains a "%" can contain environment
+    # variables.
+    has_percent = '%' in source_path
+
+    if '{' not in source_path:
+      source_paths = [source_path]
+    else:
+      source_paths = self._path_resolver.ExpandBraces(source_path)
+
+    for source_path_alternative in source_paths:
+      # Only paths with a globstar "**" need globstar expansion.
+      if '**' not in source_path_alternative:
+        path_globs = [source_path_alternative]
+      else:
+        path_globs = self._path_resolver.ExpandGlobStars(
+            source_path_alternative, path_separator)
+
+      for path_glob in path_globs:
+        for path in self._path_resolver.ExpandUsersVariable(
+            path_glob, path_separator, user_accounts):
+
+          if has_percent and '%' in path:
+            path = self._path_resolver.ExpandEnvironmentVariables(
+                path, path_separator, environment_variables)
+
+          if path.startswith(path_separator):
+            expanded_paths.append(path)
+
+    self._expanded_paths_cache[lookup_key] = expanded_paths
+
+    return expanded_paths
+
+  def _GetDefinition(self, name):
+    """Retrieves an artifact definition by name or alias.
+
+    The result of the lookup, including a failed lookup, is cached.
+
+    Args:
+      name (str): name or alias of the artifact definition.
+
+    Returns:
+      artifacts.ArtifactDefinition: artifact definition or None if not
+          available.
+    """
+    if name in self._definitions_cache:
+      return self._definitions_cache[name]
+
     definition = self._artifacts_registry.GetDefinitionByName(name)
     if not definition:
       definition = self._artifacts_registry.GetDefinitionByAlias(name)
 
+    self._definitions_cache[name] = definition
+    return definition
+
+  def _GetPathGlobsFromArtifactDefinition(
+      self, name, environment_variables=None, user_accounts=None):
+    """Retrieves path globs from an artifact definition.
+
+    Args:
+      name (str): name of the artifact definition.
+      environment_variables (Optional[list[EnvironmentVariable]]): environment
+          variables.
+      user_accounts (Optional[list[UserAccount]]): user accounts.
+
+    Returns:
+      tuple[list[tuple[str, str]], tuple[str]]: path globs and path segment
+          separators of the file sources of the artifact definition and names
+          of the artifact definitions included by its artifact group sources.
+    """
+    path_globs = []
+    group_names = []
+
+    definition = self._GetDefinition(name)
     if not definition:
       logging.warning(f'Undefined artifact definition: {name:s}')
+
     else:
       for source in definition.sources:
         source_type = source.type_indicator
-        if source_type not in (
-            artifacts_definitions.TYPE_INDICATOR_ARTIFACT_GROUP,
-            artifacts_definitions.TYPE_INDICATOR_DIRECTORY,
-            artifacts_definitions.TYPE_INDICATOR_FILE,
-            artifacts_definitions.TYPE_INDICATOR_PATH):
-          continue
-
-        if source_type == artifacts_definitions.TYPE_INDICATOR_DIRECTORY:
-          logging.warning((
-              f'Use of deprecated source type: directory in artifact '
-              f'definition: {name:s}'))
-
-        if source_type == artifacts_definitions.TYPE_INDICATOR_ARTIFACT_GROUP:
-          for source_name in set(source.names):
-            yield from self._BuildFindSpecsFromArtifactDefinition(
-                source_name, environment_variables=environment_variables,
-                user_accounts=user_accounts)
-
-        elif source_type in (
-            artifacts_definitions.TYPE_INDICATOR_DIRECTORY,
-            artifacts_definitions.TYPE_INDICATOR_FILE,
-            artifacts_definitions.TYPE_INDICATOR_PATH):
-          for source_path in set(source.paths):
-            yield from self._BuildFindSpecsFromFileSourcePath(
+        if source_type == _TYPE_INDICATOR_ARTIFACT_GROUP:
+          group_names.extend(self._GetUniqueSourceValues(source, 'names'))
+
+        elif source_type in _FILE_SOURCE_TYPE_INDICATORS:
+          if source_type == _TYPE_INDICATOR_DIRECTORY:
+            logging.warning((
+                f'Use of deprecated source type: directory in artifact '
+                f'definition: {definition.name:s}'))
+
+          for source_path in self._GetUniqueSourceValues(source, 'paths'):
+            for path in self._ExpandFileSourcePath(
                 source_path, source.separator,
                 environment_variables=environment_variables,
-                user_accounts=user_accounts)
+                user_accounts=user_accounts):
+              path_globs.append((path, source.separator))
 
-  def _BuildFindSpecsFromFileSourcePath(
-      self, source_path, path_separator, environment_variables=None,
-      user_accounts=None):
-    """Builds find specifications from a file source type.
+    return path_globs, tuple(group_names)
+
+  def _GetPathGlobsFromArtifactDefinitions(
+      self, names, environment_variables=None, user_accounts=None):
+    """Retrieves path globs from artifact definitions.
+
+    Artifact definitions included by artifact group sources are processed
+    from a worklist, where every artifact definition is only processed once,
+    also if it is included by multiple artifact groups or recursively.
 
     Args:
-      source_path (str): file system path defined by the source.
-      path_separator (str): file system path segment separator.
+      names (list[str]): names of the artifact definitions.
       environment_variables (Optional[list[EnvironmentVariable]]): environment
           variables.
       user_accounts (Optional[list[UserAccount]]): user accounts.
 
     Yields:
-      dfvfs.FindSpec: file system (dfVFS) find specification.
+      tuple[str, str]: path glob and path segment separator.
+    """
+    self._ResetCachesOnContextChange(environment_variables, user_accounts)
+
+    names_worklist = collections.deque(names)
+    visited_names = set()
+
+    while names_worklist:
+      name = names_worklist.popleft()
+      if name in visited_names:
+        continue
+
+      visited_names.add(name)
+
+      path_globs, group_names = self._GetPathGlobsFromArtifactDefinition(
+          name, environment_variables=environment_variables,
+          user_accounts=user_accounts)
+
+      yield from path_globs
+
+      names_worklist.extend(group_names)
+
+  def _GetUniqueSourceValues(self, source, attribute_name):
+    """Retrieves the unique values of a source attribute, such as its paths.
+
+    Since artifact definitions are not modified after they have been read the
+    unique values are cached per source and attribute.
+
+    Args:
+      source (artifacts.SourceType): source type.
+      attribute_name (str): name of the source attribute that contains the
+          values, such as "names" or "paths".
+
+    Returns:
+      tuple[str]: unique values in order of definition.
     """
-    for path_glob in self._path_resolver.ExpandGlobStars(
-        source_path, path_separator):
+    lookup_key = (id(source), attribute_name)
 
-      for path in self._path_resolver.ExpandUsersVariable(
-          path_glob, path_separator, user_accounts):
+    # The source is stored with its values to keep its identifier unique.
+    _, unique_values = self._source_values_cache.get(lookup_key, (None, None))
+    if unique_values is None:
+      values = getattr(source, attribute_name, None) or []
+      unique_values = tuple(dict.fromkeys(values))
+      self._source_values_cache[lookup_key] = (source, unique_values)
 
-        if '%' in path:
-          path = self._path_resolver.ExpandEnvironmentVariables(
-              path, path_separator, environment_variables)
+    return unique_values
 
-        if not path.startswith(path_separator):
-          continue
+  def _ResetCachesOnContextChange(self, environment_variables, user_accounts):
+    """Resets the expansion caches when the expansion context changes.
 
-        try:
-          find_spec = dfvfs_file_system_searcher.FindSpec(
-              case_sensitive=False, location_glob=path,
-              location_separator=path_separator)
-        except ValueError as exception:
-          logging.error((
-              f'Unable to build find specification for path: "{path:s}" with '
-              f'error: {exception!s}'))
-          continue
+    The expansion context is compared by the values of the environment
+    variables and user accounts, since a caller can change the same list of
+    environment variables or user accounts between calls.
 
-        yield find_spec
+    Args:
+      environment_variables (list[EnvironmentVariable]): environment
+          variables.
+      user_accounts (list[UserAccount]): user accounts.
+    """
+    expansion_context = (
+        tuple(
+            (environment_variable.case_sensitive, environment_variable.name,
+             environment_variable.value)
+            for environment_variable in environment_variables or []),
+        tuple(
+            (user_account.user_directory,
+             user_account.user_directory_path_separator, user_account.username)
+            for user_account in user_accounts or []))
+
+    if expansion_context != self._expansion_context:
+      self._expanded_paths_cache = {}
+      self._glob_sets_cache = {}
+      self._expansion_context = expansion_context
 
   def GetFindSpecs(
       self, names=None, environment_variables=None, user_accounts=None):
@@ -142,7 +450,42 @@ class ArtifactDefinitionFiltersGenerator(object):
     if self._user_accounts:
       user_accounts = self._user_accounts
 
-    for name in set(names or []):
-      yield from self._BuildFindSpecsFromArtifactDefinition(
-          name, environment_variables=environment_variables,
-          user_accounts=user_accounts)
+    yield from self._BuildFindSpecsFromArtifactDefinitions(
+        names or [], environment_variables=environment_variables,
+        user_accounts=user_accounts)
+
+  def GetGlobSet(
+      self, names=None, environment_variables=None, user_accounts=None):
+    """Retrieves a glob set for one or more artifact definitions.
+
+    The glob set can be used to determine which path glob of the artifact
+    definitions matches a path.
+
+    Args:
+      names (Optional[list[str]]): names of the artifact definitions to filter
+          on.
+      environment_variables (Optional[list[EnvironmentVariable]]): environment
+          variables.
+      user_accounts (Optional[list[UserAccount]]): user accounts.
+
+    Returns:
+      GlobSet: glob set.
+    """
+    if self._environment_variables:
+      environment_variables = self._environment_variables
+    if self._user_accounts:
+      user_accounts = self._user_accounts
+
+    self._ResetCachesOnContextChange(environment_variables, user_accounts)
+
+    lookup_key = frozenset(names or [])
+    glob_set = self._glob_sets_cache.get(lookup_key, None)
+    if not glob_set:
+      path_globs = list(self._GetPathGlobsFromArtifactDefinitions(
+          names or [], environment_variables=environment_variables,
+          user_accounts=user_accounts))
+
+      glob_set = GlobSet(path_globs, case_sensitive=False)
+      self._glob_sets_cache[lookup_key] = glob_set
+
+    return glob_set
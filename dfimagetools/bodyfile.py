@@ -20,6 +20,12 @@ class BodyfileGenerator(object):
 
   _ESCAPE_CHARACTERS.update(definitions.NON_PRINTABLE_CHARACTERS)
 
+  _ESCAPE_CHARACTERS_TRANSLATION_TABLE = str.maketrans(_ESCAPE_CHARACTERS)
+
+  # Translation table to escape path segments that are joined with NUL.
+  _PATH_ESCAPE_CHARACTERS_TRANSLATION_TABLE = str.maketrans({
+      **_ESCAPE_CHARACTERS, 0: '/'})
+
   _FILE_TYPES = {
       0x1000: 'p',
       0x2000: 'c',
@@ -28,10 +34,23 @@ class BodyfileGenerator(object):
       0xa000: 'l',
       0xc000: 's'}
 
+  # Bodyfile representations of the permission bits (0o777) of a mode.
+  _PERMISSIONS_STRINGS = tuple(
+      ''.join([
+          character if permissions & (0x0100 >> bit_index) else '-'
+          for bit_index, character in enumerate('rwxrwxrwx')])
+      for permissions in range(0x0200))
+
   _FILE_ATTRIBUTE_READONLY = 1
   _FILE_ATTRIBUTE_HIDDEN = 2
   _FILE_ATTRIBUTE_SYSTEM = 4
 
+  # Bodyfile representations of file attributes flags per file type, where
+  # the first string is used for writable and the second for read-only.
+  _FILE_ATTRIBUTE_FLAGS_STRINGS = {
+      file_type: (f'{file_type:s}rwxrwxrwx', f'{file_type:s}r-xr-xr-x')
+      for file_type in ('-', 'd', 'l')}
+
   _TIMESTAMP_FORMAT_STRINGS = {
       dfdatetime_definitions.PRECISION_1_NANOSECOND: '{0:d}.{1:09d}',
       dfdatetime_definitions.PRECISION_10_NANOSECONDS: '{0:d}.{1:08d}',
@@ -43,11 +62,22 @@ class BodyfileGenerator(object):
       dfdatetime_definitions.PRECISION_10_MILLISECONDS: '{0:d}.{1:02d}',
       dfdatetime_definitions.PRECISION_100_MILLISECONDS: '{0:d}.{1:01d}'}
 
+  # Bound format methods of the timestamp format strings, to prevent an
+  # attribute lookup per timestamp.
+  _TIMESTAMP_FORMATTERS = {
+      precision: format_string.format
+      for precision, format_string in _TIMESTAMP_FORMAT_STRINGS.items()}
+
+  _DEFAULT_TIMESTAMP_FORMATTER = '{0:d}'.format
+
+  # Maximum number of cached bodyfile timestamp representations.
+  _MAXIMUM_NUMBER_OF_CACHED_TIMESTAMPS = 16384
+
   def __init__(self):
     """Initializes a bodyfile generator."""
     super(BodyfileGenerator, self).__init__()
-    self._bodyfile_escape_characters = str.maketrans(self._ESCAPE_CHARACTERS)
     self._root_file_entry_identifier = None
+    self._timestamps_cache = {}
 
   def _GetFileAttributeFlagsString(self, file_type, file_attribute_flags):
     """Retrieves a bodyfile string representation of file attributes flags.
@@ -59,15 +89,9 @@ class BodyfileGenerator(object):
     Returns:
       str: bodyfile representation of the file attributes flags.
     """
-    string_parts = [file_type, 'r', 'w', 'x', 'r', 'w', 'x', 'r', 'w', 'x']
-
-    if (file_attribute_flags & self._FILE_ATTRIBUTE_READONLY or
-        file_attribute_flags & self._FILE_ATTRIBUTE_SYSTEM):
-      string_parts[2] = '-'
-      string_parts[5] = '-'
-      string_parts[8] = '-'
-
-    return ''.join(string_parts)
+    is_read_only = bool(file_attribute_flags & (
+        self._FILE_ATTRIBUTE_READONLY | self._FILE_ATTRIBUTE_SYSTEM))
+    return self._FILE_ATTRIBUTE_FLAGS_STRINGS[file_type][is_read_only]
 
   def _GetModeString(self, mode):
     """Retrieves a bodyfile string representation of a mode.
@@ -78,32 +102,29 @@ class BodyfileGenerator(object):
     Returns:
       str: bodyfile representation of the mode.
     """
-    string_parts = 10 * ['-']
+    file_type = self._FILE_TYPES.get(mode & 0xf000, '-')
+    permissions_string = self._PERMISSIONS_STRINGS[mode & 0x01ff]
+    return f'{file_type:s}{permissions_string:s}'
 
-    if mode & 0x0001:
-      string_parts[9] = 'x'
-    if mode & 0x0002:
-      string_parts[8] = 'w'
-    if mode & 0x0004:
-      string_parts[7] = 'r'
+  def _GetPath(self, path_segments):
+    """Retrieves a bodyfile path representation of path segments.
 
-    if mode & 0x0008:
-      string_parts[6] = 'x'
-    if mode & 0x0010:
-      string_parts[5] = 'w'
-    if mode & 0x0020:
-      string_parts[4] = 'r'
-
-    if mode & 0x0040:
-      string_parts[3] = 'x'
-    if mode & 0x0080:
-      string_parts[2] = 'w'
-    if mode & 0x0100:
-      string_parts[1] = 'r'
+    Args:
+      path_segments (list[str]): path segments.
 
-    string_parts[0] = self._FILE_TYPES.get(mode & 0xf000, '-')
+    Returns:
+      str: bodyfile path representation of the path segments.
+    """
+    # To escape all path segments with a single translate, the path segments
+    # are joined with a NUL character, which is translated into "/". This is
+    # only possible if the path segments themselves do not contain NUL.
+    path = '\x00'.join(path_segments)
+    if path.count('\x00') == len(path_segments) - 1:
+      return path.translate(self._PATH_ESCAPE_CHARACTERS_TRANSLATION_TABLE)
 
-    return ''.join(string_parts)
+    return '/'.join([
+        segment.translate(self._ESCAPE_CHARACTERS_TRANSLATION_TABLE)
+        for segment in path_segments])
 
   def _GetTimestamp(self, date_time):
     """Retrieves a bodyfile timestamp representation of a date time value.
@@ -117,11 +138,33 @@ class BodyfileGenerator(object):
     if not date_time:
       return ''
 
+    # Date time values often share the same timestamp, such as the
+    # $STANDARD_INFORMATION and $FILE_NAME timestamps of a NTFS file entry,
+    # hence the representations of date time values that have a timestamp
+    # are cached by value.
+    timestamp = getattr(date_time, 'timestamp', None)
+    if timestamp is not None:
+      lookup_key = (
+          date_time.__class__, date_time.precision,
+          getattr(date_time, 'time_zone_offset', None), timestamp)
+      bodyfile_timestamp = self._timestamps_cache.get(lookup_key, None)
+      if bodyfile_timestamp is not None:
+        return bodyfile_timestamp
+
     posix_timestamp, fraction_of_second = (
         date_time.CopyToPosixTimestampWithFractionOfSecond())
-    format_string = self._TIMESTAMP_FORMAT_STRINGS.get(
-        date_time.precision, '{0:d}')
-    return format_string.format(posix_timestamp, fraction_of_second)
+    formatter = self._TIMESTAMP_FORMATTERS.get(
+        date_time.precision, self._DEFAULT_TIMESTAMP_FORMATTER)
+    bodyfile_timestamp = formatter(posix_timestamp, fraction_of_second)
+
+    if timestamp is not None:
+      if len(self._timestamps_cache) >= (
+          self._MAXIMUM_NUMBER_OF_CACHED_TIMESTAMPS):
+        self._timestamps_cache = {}
+
+      self._timestamps_cache[lookup_key] = bodyfile_timestamp
+
+    return bodyfile_timestamp
 
   def GetEntries(self, file_entry, path_segments):
     """Retrieves bodyfile entry representations of a file entry.
@@ -133,13 +176,18 @@ class BodyfileGenerator(object):
     Yields:
       str: bodyfile entry.
     """
+    type_indicator = file_entry.type_indicator
+    is_fat_or_ntfs = type_indicator in (
+        dfvfs_definitions.TYPE_INDICATOR_FAT,
+        dfvfs_definitions.TYPE_INDICATOR_NTFS)
+
     file_attribute_flags = None
     parent_file_reference = None
-    if file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_FAT:
+    if type_indicator == dfvfs_definitions.TYPE_INDICATOR_FAT:
       fsfat_file_entry = file_entry.GetFATFileEntry()
       file_attribute_flags = fsfat_file_entry.file_attribute_flags
 
-    elif file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_NTFS:
+    elif type_indicator == dfvfs_definitions.TYPE_INDICATOR_NTFS:
       mft_attribute_index = getattr(file_entry.path_spec, 'mft_attribute', None)
       if mft_attribute_index is not None:
         fsntfs_file_entry = file_entry.GetNTFSFileEntry()
@@ -149,21 +197,20 @@ class BodyfileGenerator(object):
                 mft_attribute_index))
 
     stat_attribute = file_entry.GetStatAttribute()
+    inode_number = stat_attribute.inode_number
 
-    if stat_attribute.inode_number is None:
+    if inode_number is None:
       inode_string = ''
-    elif file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_FAT:
-      inode_string = f'0x{stat_attribute.inode_number:x}'
-    elif file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_NTFS:
-      mft_entry_number = stat_attribute.inode_number & 0xffffffffffff
-      mft_sequence_number = stat_attribute.inode_number >> 48
+    elif type_indicator == dfvfs_definitions.TYPE_INDICATOR_FAT:
+      inode_string = f'0x{inode_number:x}'
+    elif type_indicator == dfvfs_definitions.TYPE_INDICATOR_NTFS:
+      mft_entry_number = inode_number & 0xffffffffffff
+      mft_sequence_number = inode_number >> 48
       inode_string = f'{mft_entry_number:d}-{mft_sequence_number:d}'
     else:
-      inode_string = f'{stat_attribute.inode_number:d}'
+      inode_string = f'{inode_number:d}'
 
-    if file_entry.type_indicator not in (
-        dfvfs_definitions.TYPE_INDICATOR_FAT,
-        dfvfs_definitions.TYPE_INDICATOR_NTFS):
+    if not is_fat_or_ntfs:
       mode = getattr(stat_attribute, 'mode', None) or 0
       mode_string = self._GetModeString(mode)
 
@@ -176,18 +223,22 @@ class BodyfileGenerator(object):
         file_type = '-'
 
       if file_attribute_flags is None:
-        mode_string = ''.join([file_type] + (9 * ['-']))
+        mode_string = f'{file_type:s}---------'
       else:
         mode_string = self._GetFileAttributeFlagsString(
             file_type, file_attribute_flags)
 
-    owner_identifier = ''
-    if stat_attribute.owner_identifier is not None:
-      owner_identifier = str(stat_attribute.owner_identifier)
+    owner_identifier = stat_attribute.owner_identifier
+    if owner_identifier is None:
+      owner_identifier = ''
+    else:
+      owner_identifier = str(owner_identifier)
 
-    group_identifier = ''
-    if stat_attribute.group_identifier is not None:
-      group_identifier = str(stat_attribute.group_identifier)
+    group_identifier = stat_attribute.group_identifier
+    if group_identifier is None:
+      group_identifier = ''
+    else:
+      group_identifier = str(group_identifier)
 
     size = str(file_entry.size)
 
@@ -199,56 +250,60 @@ class BodyfileGenerator(object):
     # TODO: add support to calculate MD5
     md5_string = '0'
 
-    path_segments = [
-        segment.translate(self._bodyfile_escape_characters)
-        for segment in path_segments]
-    file_entry_name_value = '/'.join(path_segments) or '/'
+    file_entry_name_value = self._GetPath(path_segments) or '/'
 
-    if not file_entry.link:
+    link = file_entry.link
+    if not link:
       name_value = file_entry_name_value
     else:
-      if file_entry.type_indicator in (
-          dfvfs_definitions.TYPE_INDICATOR_FAT,
-          dfvfs_definitions.TYPE_INDICATOR_NTFS):
-        path_segments = file_entry.link.split('\\')
+      if is_fat_or_ntfs:
+        path_segments = link.split('\\')
       else:
-        path_segments = file_entry.link.split('/')
+        path_segments = link.split('/')
 
-      file_entry_link = '/'.join([
-          segment.translate(self._bodyfile_escape_characters)
-          for segment in path_segments])
+      file_entry_link = self._GetPath(path_segments)
       name_value = ' -> '.join([file_entry_name_value, file_entry_link])
 
-    yield '|'.join([
-        md5_string, name_value, inode_string, mode_string, owner_identifier,
-        group_identifier, size, access_time, modification_time, change_time,
-        creation_time])
+    # The values that are shared by all bodyfile entries of the file entry.
+    file_entry_values = (
+        f'{inode_string:s}|{mode_string:s}|{owner_identifier:s}|'
+        f'{group_identifier:s}|{size:s}')
+    timestamp_values = (
+        f'{access_time:s}|{modification_time:s}|{change_time:s}|'
+        f'{creation_time:s}')
+
+    yield (
+        f'{md5_string:s}|{name_value:s}|{file_entry_values:s}|'
+        f'{timestamp_values:s}')
 
     for data_stream in file_entry.data_streams:
       if data_stream.name:
         data_stream_name = data_stream.name.translate(
-            self._bodyfile_escape_characters)
+            self._ESCAPE_CHARACTERS_TRANSLATION_TABLE)
         data_stream_name_value = ':'.join([
             file_entry_name_value, data_stream_name])
 
-        yield '|'.join([
-            md5_string, data_stream_name_value, inode_string, mode_string,
-            owner_identifier, group_identifier, size, access_time,
-            modification_time, change_time, creation_time])
+        yield (
+            f'{md5_string:s}|{data_stream_name_value:s}|'
+            f'{file_entry_values:s}|{timestamp_values:s}')
+
+    # Only NTFS file entries have $FILE_NAME attributes.
+    if type_indicator != dfvfs_definitions.TYPE_INDICATOR_NTFS:
+      return
 
     for attribute in file_entry.attributes:
-      if isinstance(attribute, dfvfs_ntfs_attribute.FileNameNTFSAttribute):
-        if (attribute.name == file_entry.name and
-            attribute.parent_file_reference == parent_file_reference):
-          attribute_name_value = ' '.join([
-              file_entry_name_value, '($FILE_NAME)'])
-
-          access_time = self._GetTimestamp(attribute.access_time)
-          creation_time = self._GetTimestamp(attribute.creation_time)
-          change_time = self._GetTimestamp(attribute.entry_modification_time)
-          modification_time = self._GetTimestamp(attribute.modification_time)
-
-          yield '|'.join([
-              md5_string, attribute_name_value, inode_string, mode_string,
-              owner_identifier, group_identifier, size, access_time,
-              modification_time, change_time, creation_time])
+      if (isinstance(attribute, dfvfs_ntfs_attribute.FileNameNTFSAttribute) and
+          attribute.name == file_entry.name and
+          attribute.parent_file_reference == parent_file_reference):
+        attribute_name_value = ' '.join([
+            file_entry_name_value, '($FILE_NAME)'])
+
+        access_time = self._GetTimestamp(attribute.access_time)
+        creation_time = self._GetTimestamp(attribute.creation_time)
+        change_time = self._GetTimestamp(attribute.entry_modification_time)
+        modification_time = self._GetTimestamp(attribute.modification_time)
+
+        yield (
+            f'{md5_string:s}|{attribute_name_value:s}|'
+            f'{file_entry_values:s}|{access_time:s}|'
+            f'{modification_time:s}|{change_time:s}|{creation_time:s}')
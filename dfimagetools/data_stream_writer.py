@@ -2,6 +2,7 @@
 """Helper to write data streams."""
 
 import os
+import shutil
 
 from dfimagetools import definitions
 
@@ -17,11 +18,34 @@ class DataStreamWriter(object):
       '|', '~']
   _INVALID_PATH_CHARACTERS.extend(definitions.NON_PRINTABLE_CHARACTERS.keys())
 
-  def __init__(self):
-    """Initializes a data stream writer."""
-    super(DataStreamWriter, self).__init__()
-    self._invalid_path_characters = str.maketrans({
-        value: '_' for value in self._INVALID_PATH_CHARACTERS})
+  _INVALID_PATH_CHARACTERS_TRANSLATION_TABLE = str.maketrans({
+      value: '_' for value in _INVALID_PATH_CHARACTERS})
+
+  # Invalid path characters in the ASCII range, used to sanitize ASCII-only
+  # path segments on their byte representation, which is faster.
+  _INVALID_PATH_BYTES = bytes(sorted(
+      value for value in _INVALID_PATH_CHARACTERS_TRANSLATION_TABLE
+      if value < 0x80))
+
+  _INVALID_PATH_BYTES_TRANSLATION_TABLE = bytes.maketrans(
+      _INVALID_PATH_BYTES, b'_' * len(_INVALID_PATH_BYTES))
+
+  def _SanitizePathSegment(self, path_segment):
+    """Replaces invalid path characters in a path segment.
+
+    Args:
+      path_segment (str): path segment.
+
+    Returns:
+      str: sanitized path segment.
+    """
+    if path_segment.isascii():
+      path_segment = path_segment.encode('ascii')
+      return path_segment.translate(
+          self._INVALID_PATH_BYTES_TRANSLATION_TABLE).decode('ascii')
+
+    return path_segment.translate(
+        self._INVALID_PATH_CHARACTERS_TRANSLATION_TABLE)
 
   def GetDisplayPath(
       self, source_path_segments, source_data_stream_name):
@@ -61,13 +85,13 @@ class DataStreamWriter(object):
       str: sanitized path.
     """
     path_segments = [
-        path_segment.translate(self._invalid_path_characters)
+        self._SanitizePathSegment(path_segment)
         for path_segment in source_path_segments]
 
     destination_path = os.path.join(target_path, *path_segments)
     if source_data_stream_name:
-      source_data_stream_name = source_data_stream_name.translate(
-          self._invalid_path_characters)
+      source_data_stream_name = self._SanitizePathSegment(
+          source_data_stream_name)
       destination_path = '_'.join([destination_path, source_data_stream_name])
 
     return destination_path
@@ -88,8 +112,6 @@ class DataStreamWriter(object):
     if source_file_object:
       with open(destination_path, 'wb') as destination_file_object:
         source_file_object.seek(0, os.SEEK_SET)
-
-        data = source_file_object.read(self._READ_BUFFER_SIZE)
-        while data:
-          destination_file_object.write(data)
-          data = source_file_object.read(self._READ_BUFFER_SIZE)
+        shutil.copyfileobj(
+            source_file_object, destination_file_object,
+            length=self._READ_BUFFER_SIZE)
@@ -11,15 +11,15 @@ class WindowsEnvironmentVariablesCollector(object):
       'HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Control\\'
       'Session Manager\\Environment')
 
-  _PROFILELIST_KEY_PATH = (
-      'HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows NT\\CurrentVersion\\'
-      'ProfileList')
+  _MICROSOFT_KEY_PATH = 'HKEY_LOCAL_MACHINE\\Software\\Microsoft'
 
-  _WINDOWS_CURRENTVERSION_KEY_PATH = (
-      'HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows\\CurrentVersion')
+  _PROFILELIST_KEY_NAME = 'ProfileList'
 
-  _WINDOWS_NT_CURRENTVERSION_KEY_PATH = (
-      'HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows NT\\CurrentVersion')
+  # Key paths relative to the Microsoft key, so that the Microsoft key is
+  # resolved from the Windows Registry only once.
+  _WINDOWS_CURRENTVERSION_SUBKEY_PATH = 'Windows\\CurrentVersion'
+
+  _WINDOWS_NT_CURRENTVERSION_SUBKEY_PATH = 'Windows NT\\CurrentVersion'
 
   _PROFILELIST_KEY_VALUE_MAPPINGS = {
       'AllUsersProfile': '%AllUsersProfile%',
@@ -84,18 +84,25 @@ class WindowsEnvironmentVariablesCollector(object):
       yield from self._CollectEnvironmentVariablesFromEnvironmentKey(
           registry_key)
 
-    registry_key = registry.GetKeyByPath(self._PROFILELIST_KEY_PATH)
-    if registry_key:
-      yield from self._CollectEnvironmentVariablesWithMappings(
-          registry_key, self._PROFILELIST_KEY_VALUE_MAPPINGS)
-
-    registry_key = registry.GetKeyByPath(self._WINDOWS_CURRENTVERSION_KEY_PATH)
+    microsoft_key = registry.GetKeyByPath(self._MICROSOFT_KEY_PATH)
+    if not microsoft_key:
+      return
+
+    windows_nt_key = microsoft_key.GetSubkeyByPath(
+        self._WINDOWS_NT_CURRENTVERSION_SUBKEY_PATH)
+    if windows_nt_key:
+      registry_key = windows_nt_key.GetSubkeyByName(
+          self._PROFILELIST_KEY_NAME)
+      if registry_key:
+        yield from self._CollectEnvironmentVariablesWithMappings(
+            registry_key, self._PROFILELIST_KEY_VALUE_MAPPINGS)
+
+    registry_key = microsoft_key.GetSubkeyByPath(
+        self._WINDOWS_CURRENTVERSION_SUBKEY_PATH)
     if registry_key:
       yield from self._CollectEnvironmentVariablesWithMappings(
           registry_key, self._WINDOWS_KEY_VALUE_MAPPINGS)
 
-    registry_key = registry.GetKeyByPath(
-        self._WINDOWS_NT_CURRENTVERSION_KEY_PATH)
-    if registry_key:
+    if windows_nt_key:
       yield from self._CollectEnvironmentVariablesWithMappings(
-          registry_key, self._WINDOWS_NT_KEY_VALUE_MAPPINGS)
+          windows_nt_key, self._WINDOWS_NT_KEY_VALUE_MAPPINGS)
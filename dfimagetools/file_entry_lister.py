@@ -17,11 +17,12 @@ from dfimagetools import definitions
 class FileEntryLister(volume_scanner.VolumeScanner):
   """File entry lister."""
 
-  _WINDOWS_DIRECTORIES = frozenset([
+  # Candidate Windows directories, in order of likelihood.
+  _WINDOWS_DIRECTORIES = (
       'C:\\Windows',
       'C:\\WINNT',
       'C:\\WTSRV',
-      'C:\\WINNT35'])
+      'C:\\WINNT35')
 
   def __init__(self, mediator=None, use_aliases=True):
     """Initializes a file entry lister.
@@ -33,23 +34,21 @@ class FileEntryLister(volume_scanner.VolumeScanner):
           should be used.
     """
     super(FileEntryLister, self).__init__(mediator=mediator)
+    self._base_path_segments_cache = {}
     self._list_only_files = False
     self._use_aliases = use_aliases
+    self._windows_directories_cache = {}
 
-  def _GetBasePathSegments(self, base_path_spec):
-    """Retrieves the base path segments.
+  def _GetBasePathSegment(self, base_path_spec):
+    """Retrieves the base path segment of a single path specification.
 
     Args:
-      base_path_specs (list[dfvfs.PathSpec]): source path specification.
+      base_path_spec (dfvfs.PathSpec): source path specification.
 
     Returns:
-      list[str]: path segments.
+      str: path segment or None if the path specification does not have
+          a corresponding base path segment.
     """
-    if not base_path_spec:
-      return ['']
-
-    path_segments = self._GetBasePathSegments(base_path_spec.parent)
-
     type_indicator = base_path_spec.type_indicator
 
     if type_indicator in (
@@ -57,8 +56,7 @@ class FileEntryLister(volume_scanner.VolumeScanner):
         dfvfs_definitions.TYPE_INDICATOR_GPT,
         dfvfs_definitions.TYPE_INDICATOR_LVM):
       if not self._use_aliases:
-        path_segments.append(base_path_spec.location[1:])
-        return path_segments
+        return base_path_spec.location[1:]
 
       volume_system = dfvfs_volume_system_factory.Factory.NewVolumeSystem(
           type_indicator)
@@ -73,28 +71,59 @@ class FileEntryLister(volume_scanner.VolumeScanner):
 
       volume_identifier = volume.GetAttribute('identifier')
 
-      volume_path_segment = (
-          f'{volume_identifier_prefix:s}{{{volume_identifier.value:s}}}')
-      path_segments.append(volume_path_segment)
-      return path_segments
+      return f'{volume_identifier_prefix:s}{{{volume_identifier.value:s}}}'
 
     if type_indicator in (
         dfvfs_definitions.TYPE_INDICATOR_BDE,
         dfvfs_definitions.TYPE_INDICATOR_LUKSDE):
-      path_segments.append(type_indicator)
-      return path_segments
+      return type_indicator
 
     if type_indicator == dfvfs_definitions.TYPE_INDICATOR_TSK_PARTITION:
-      path_segments.append(base_path_spec.location[1:])
-      return path_segments
+      return base_path_spec.location[1:]
+
+    return None
+
+  def _GetBasePathSegments(self, base_path_spec):
+    """Retrieves the base path segments.
+
+    The base path segments are cached per base path specification, since
+    determining volume aliases requires opening the volume system.
 
-    return path_segments
+    Args:
+      base_path_spec (dfvfs.PathSpec): source path specification.
+
+    Returns:
+      list[str]: path segments.
+    """
+    if not base_path_spec:
+      return ['']
 
-  def _ListFileEntry(self, file_system, file_entry, parent_path_segments):
+    lookup_key = base_path_spec.comparable
+    path_segments = self._base_path_segments_cache.get(lookup_key, None)
+    if path_segments is None:
+      # The base path segments are determined from the root of the path
+      # specification chain, such as the storage media image, up to the base
+      # path specification, instead of recursing over the parents.
+      path_specs = []
+      while base_path_spec:
+        path_specs.append(base_path_spec)
+        base_path_spec = base_path_spec.parent
+
+      path_segments = ['']
+      for path_spec in reversed(path_specs):
+        path_segment = self._GetBasePathSegment(path_spec)
+        if path_segment is not None:
+          path_segments.append(path_segment)
+
+      path_segments = tuple(path_segments)
+      self._base_path_segments_cache[lookup_key] = path_segments
+
+    return list(path_segments)
+
+  def _ListFileEntry(self, file_entry, parent_path_segments):
     """Lists a file entry.
 
     Args:
-      file_system (dfvfs.FileSystem): file system that contains the file entry.
       file_entry (dfvfs.FileEntry): file entry to list.
       parent_path_segments (str): path segments of the full path of the parent
           file entry.
@@ -102,15 +131,31 @@ class FileEntryLister(volume_scanner.VolumeScanner):
     Yields:
       tuple[dfvfs.FileEntry, list[str]]: file entry and path segments.
     """
-    path_segments = list(parent_path_segments)
+    path_segments = tuple(parent_path_segments)
     if not file_entry.IsRoot():
-      path_segments.append(file_entry.name)
+      path_segments = (*path_segments, file_entry.name)
 
     if not self._list_only_files or file_entry.IsFile():
-      yield file_entry, path_segments
+      yield file_entry, list(path_segments)
 
-    for sub_file_entry in file_entry.sub_file_entries:
-      yield from self._ListFileEntry(file_system, sub_file_entry, path_segments)
+    # The sub file entries are listed depth-first using a stack of iterators,
+    # instead of recursion, to preserve the order of a recursive listing
+    # without the overhead of a nested generator per directory.
+    stack = [(iter(file_entry.sub_file_entries), path_segments)]
+    while stack:
+      sub_file_entries, parent_path_segments = stack[-1]
+
+      sub_file_entry = next(sub_file_entries, None)
+      if sub_file_entry is None:
+        stack.pop()
+        continue
+
+      path_segments = (*parent_path_segments, sub_file_entry.name)
+
+      if not self._list_only_files or sub_file_entry.IsFile():
+        yield sub_file_entry, list(path_segments)
+
+      stack.append((iter(sub_file_entry.sub_file_entries), path_segments))
 
   def GetWindowsDirectory(self, base_path_spec):
     """Retrieves the Windows directory from the base path specification.
@@ -121,6 +166,10 @@ class FileEntryLister(volume_scanner.VolumeScanner):
     Returns:
       str: path of the Windows directory or None if not available.
     """
+    lookup_key = base_path_spec.comparable
+    if lookup_key in self._windows_directories_cache:
+      return self._windows_directories_cache[lookup_key]
+
     if base_path_spec.type_indicator == dfvfs_definitions.TYPE_INDICATOR_OS:
       mount_point = base_path_spec
     else:
@@ -130,12 +179,16 @@ class FileEntryLister(volume_scanner.VolumeScanner):
     path_resolver = windows_path_resolver.WindowsPathResolver(
         file_system, mount_point)
 
+    windows_directory = None
     for windows_path in self._WINDOWS_DIRECTORIES:
       windows_path_spec = path_resolver.ResolvePath(windows_path)
       if windows_path_spec is not None:
-        return windows_path
+        windows_directory = windows_path
+        break
 
-    return None
+    self._windows_directories_cache[lookup_key] = windows_directory
+
+    return windows_directory
 
   def ListFileEntries(self, base_path_specs):
     """Lists file entries in the base path specifications.
@@ -164,8 +217,7 @@ class FileEntryLister(volume_scanner.VolumeScanner):
         base_path_segments.insert(0, '')
         base_path_segments.pop()
 
-      yield from self._ListFileEntry(
-          file_system, file_entry, base_path_segments)
+      yield from self._ListFileEntry(file_entry, base_path_segments)
 
   def ListFileEntriesWithFindSpecs(self, base_path_specs, find_specs):
     """Lists file entries in the base path specifications.
@@ -201,6 +253,4 @@ class FileEntryLister(volume_scanner.VolumeScanner):
         file_entry = dfvfs_resolver.Resolver.OpenFileEntry(path_spec)
         path_segments = file_system.SplitPath(path_spec.location)
 
-        full_path_segments = list(base_path_segments)
-        full_path_segments.extend(path_segments)
-        yield file_entry, full_path_segments
+        yield file_entry, base_path_segments + path_segments
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Artifact definitions helper functions."""
+
+import os
+
+import artifacts
+
+from artifacts import reader as artifacts_reader
+from artifacts import registry as artifacts_registry
+
+
+def GetDefaultArtifactDefinitionsPath():
+  """Retrieves the path of the default artifact definitions.
+
+  Returns:
+    str: path of the directory containing the artifact definitions .yaml files
+        or None if not available.
+  """
+  artifact_definitions = os.path.join(
+      os.path.dirname(artifacts.__file__), 'data')
+  if not os.path.exists(artifact_definitions):
+    artifact_definitions = os.path.join('/', 'usr', 'share', 'artifacts')
+  if not os.path.exists(artifact_definitions):
+    artifact_definitions = None
+
+  return artifact_definitions
+
+
+def ReadArtifactDefinitionsRegistry(
+    artifact_definitions, custom_artifact_definitions):
+  """Reads an artifact definitions registry.
+
+  Args:
+    artifact_definitions (str): path to a directory or file containing the
+        artifact definition .yaml files or None if not set.
+    custom_artifact_definitions (str): path to a directory or file containing
+        the custom artifact definition .yaml files or None if not set.
+
+  Returns:
+    artifacts.ArtifactDefinitionsRegistry: artifact definitions registry.
+  """
+  registry = artifacts_registry.ArtifactDefinitionsRegistry()
+  reader = artifacts_reader.YamlArtifactsReader()
+
+  for path in (artifact_definitions, custom_artifact_definitions):
+    if not path:
+      continue
+
+    if os.path.isdir(path):
+      registry.ReadFromDirectory(reader, path)
+    elif os.path.isfile(path):
+      registry.ReadFromFile(reader, path)
+
+  return registry
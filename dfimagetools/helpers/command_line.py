@@ -2,6 +2,9 @@
 """Command line argument helper functions."""
 
 import codecs
+import contextlib
+import io
+import sys
 
 from dfvfs.helpers import command_line as dfvfs_command_line
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
@@ -63,6 +66,47 @@ def AddStorageMediaImageCLIArguments(argument_parser):
           'with: "all".'))
 
 
+@contextlib.contextmanager
+def OpenBufferedStdout(buffer_size=1024 * 1024):
+  """Opens stdout for writing with a large buffer.
+
+  Output written to the yielded file-like object is only written to stdout
+  when the buffer is full or when the context is exited. Exiting the context
+  does not close stdout.
+
+  If stdout is a terminal or has no binary buffer, for example when it was
+  replaced by a StringIO object, stdout itself is yielded. This also keeps
+  the console writer on Windows, which is needed to write Unicode.
+
+  Args:
+    buffer_size (Optional[int]): size of the write buffer in bytes.
+
+  Yields:
+    file: text file-like object that writes to stdout.
+  """
+  stdout_buffer = getattr(sys.stdout, 'buffer', None)
+  if not stdout_buffer or sys.stdout.isatty():
+    try:
+      yield sys.stdout
+    finally:
+      sys.stdout.flush()
+    return
+
+  # Ensure output that was written before is not reordered.
+  sys.stdout.flush()
+
+  output_writer = io.TextIOWrapper(
+      io.BufferedWriter(stdout_buffer, buffer_size=buffer_size),
+      encoding=sys.stdout.encoding, errors=sys.stdout.errors,
+      write_through=False)
+  try:
+    yield output_writer
+  finally:
+    output_writer.flush()
+    # Detach instead of close the buffers, to keep stdout open.
+    output_writer.detach().detach()
+
+
 def ParseStorageMediaImageCLIArguments(options):
   """Parses storage media image command line arguments.
 
@@ -7,8 +7,15 @@ import logging
 class PathResolver(object):
   """Path resolver."""
 
+  # Maximum number of paths a single brace expansion can produce.
+  _BRACE_EXPANSION_LIMIT = 1024
+
   _GLOBSTAR_RECURSION_LIMIT = 10
 
+  # Expansions of the users variables into user profile relative paths.
+  # Expansions that refer to other users variables, such as %%users.temp%%
+  # referring to %%users.localappdata%%, are stored fully expanded, so that
+  # they can be resolved without recursion.
   _PATH_EXPANSIONS_PER_USERS_VARIABLE = {
       '%%users.appdata%%': [
           ['%%users.userprofile%%', 'AppData', 'Roaming'],
@@ -19,13 +26,21 @@ class PathResolver(object):
       '%%users.localappdata_low%%': [
           ['%%users.userprofile%%', 'AppData', 'LocalLow']],
       '%%users.temp%%': [
-          ['%%users.localappdata%%', 'Temp']]}
+          ['%%users.userprofile%%', 'AppData', 'Local', 'Temp'],
+          ['%%users.userprofile%%', 'Local Settings', 'Application Data',
+           'Temp']]}
 
   _USER_DIRECTORY_VARIABLES = (
       '%%users.homedir%%', '%%users.userprofile%%')
 
-  _WINDOWS_DRIVE_INDICATORS = (
-      '%%environ_systemdrive%%', '%systemdrive%')
+  _WINDOWS_DRIVE_INDICATORS = frozenset([
+      '%%environ_systemdrive%%', '%systemdrive%'])
+
+  def __init__(self):
+    """Initializes a path resolver."""
+    super(PathResolver, self).__init__()
+    self._environment_variables_lookup_table = None
+    self._environment_variables_lookup_table_key = None
 
   def _CreateEnvironmentVariablesLookupTable(self, environment_variables):
     """Creates an environment variables lookup table.
@@ -58,6 +73,70 @@ class PathResolver(object):
 
     return lookup_table
 
+  def _GetBraceAlternatives(self, path):
+    """Retrieves the outermost left brace alternatives in a path.
+
+    Only a matching pair of braces that contains a comma, such as "{a,b}",
+    defines alternatives.
+
+    Args:
+      path (str): path with braces.
+
+    Returns:
+      tuple[int, int, list[str]]: start and end index of the braces and the
+          alternatives or None if the path contains no brace alternatives.
+    """
+    brace_alternatives = None
+    brace_stack = []
+
+    for index, character in enumerate(path):
+      if character == '{':
+        brace_stack.append((index, []))
+
+      elif character == ',' and brace_stack:
+        brace_stack[-1][1].append(index)
+
+      elif character == '}' and brace_stack:
+        start_index, comma_indexes = brace_stack.pop()
+        if comma_indexes and (
+            brace_alternatives is None or start_index < brace_alternatives[0]):
+          alternatives = []
+          alternative_start_index = start_index + 1
+          for comma_index in comma_indexes:
+            alternatives.append(path[alternative_start_index:comma_index])
+            alternative_start_index = comma_index + 1
+          alternatives.append(path[alternative_start_index:index])
+
+          brace_alternatives = (start_index, index, alternatives)
+
+    return brace_alternatives
+
+  def _GetEnvironmentVariablesLookupTable(self, environment_variables):
+    """Retrieves an environment variables lookup table.
+
+    The lookup table is reused as long as environment variables with the same
+    names and values are passed, since paths are typically expanded in batches
+    with the same environment variables. The names and values are compared
+    instead of the list, since a caller can change the list between calls.
+
+    Args:
+      environment_variables (list[EnvironmentVariable]): environment variables.
+
+    Returns:
+      dict[str, str]: environment variables lookup table.
+    """
+    lookup_key = tuple(
+        (environment_variable.name, environment_variable.value)
+        for environment_variable in environment_variables or [])
+
+    if (self._environment_variables_lookup_table is None or
+        lookup_key != self._environment_variables_lookup_table_key):
+      self._environment_variables_lookup_table = (
+          self._CreateEnvironmentVariablesLookupTable(environment_variables))
+      self._environment_variables_lookup_table_key = lookup_key
+
+    return self._environment_variables_lookup_table
+
   def _ExpandEnvironmentVariablesInPathSegments(
       self, path_segments, environment_variables):
     """Expands environment variables in path segments.
@@ -69,16 +148,14 @@ class PathResolver(object):
     Returns:
       list[str]: path segments with environment variables expanded.
     """
-    if environment_variables is None:
-      environment_variables = []
-
-    lookup_table = self._CreateEnvironmentVariablesLookupTable(
+    lookup_table = self._GetEnvironmentVariablesLookupTable(
         environment_variables)
 
-    # Make a copy of path_segments since this loop can change it.
-    for index, path_segment in enumerate(list(path_segments)):
+    expanded_path_segments = []
+    for path_segment in path_segments:
       if (len(path_segment) <= 2 or not path_segment[0] == '%' or
           not path_segment[-1] == '%'):
+        expanded_path_segments.append(path_segment)
         continue
 
       path_segment_upper_case = path_segment.upper()
@@ -87,18 +164,12 @@ class PathResolver(object):
       else:
         lookup_key = path_segment_upper_case[1:-1]
       path_segment = lookup_table.get(lookup_key, path_segment)
-      path_segment = path_segment.split('\\')
+      expanded_path_segments.extend(path_segment.split('\\'))
 
-      expanded_path_segments = list(path_segments[:index])
-      expanded_path_segments.extend(path_segment)
-      expanded_path_segments.extend(path_segments[index + 1:])
+    if self._IsWindowsDrivePathSegment(expanded_path_segments[0]):
+      expanded_path_segments[0] = ''
 
-      path_segments = expanded_path_segments
-
-    if self._IsWindowsDrivePathSegment(path_segments[0]):
-      path_segments[0] = ''
-
-    return path_segments
+    return expanded_path_segments
 
   def _ExpandUserDirectoryVariableInPathSegments(
       self, path_segments, path_separator, user_accounts):
@@ -180,10 +251,7 @@ class PathResolver(object):
     if not path_segments:
       return []
 
-    path_segments_lower = [
-        path_segment.lower() for path_segment in path_segments]
-
-    if path_segments_lower[0] in self._USER_DIRECTORY_VARIABLES:
+    if path_segments[0].lower() in self._USER_DIRECTORY_VARIABLES:
       return self._ExpandUserDirectoryVariableInPathSegments(
           path_segments, path_separator, user_accounts)
 
@@ -197,7 +265,7 @@ class PathResolver(object):
         expanded_path_segments = list(path_expansion)
         expanded_path_segments.extend(path_segments[1:])
 
-        paths = self._ExpandUsersVariableInPathSegments(
+        paths = self._ExpandUserDirectoryVariableInPathSegments(
             expanded_path_segments, path_separator, user_accounts)
         expanded_paths.extend(paths)
 
@@ -222,13 +290,59 @@ class PathResolver(object):
     Returns:
       bool: True if the path segment contains a Windows Drive indicator.
     """
-    if (len(path_segment) == 2 and path_segment[1] == ':' and
-        path_segment[0].isalpha()):
-      return True
+    if len(path_segment) == 2:
+      return path_segment[1] == ':' and path_segment[0].isalpha()
+
+    # All Windows drive indicator variables start with a "%".
+    if path_segment[:1] != '%':
+      return False
 
     path_segment_lower = path_segment.lower()
     return path_segment_lower in self._WINDOWS_DRIVE_INDICATORS
 
+  def ExpandBraces(self, path):
+    """Expands brace alternatives, such as "{a,b}".
+
+    A brace expansion is only performed on a matching pair of braces that
+    contains a comma, other braces, such as in "{GUID}", are left as-is.
+
+    Args:
+      path (str): path with brace alternatives.
+
+    Returns:
+      list[str]: paths for which the brace alternatives have been expanded.
+    """
+    expanded_paths = []
+
+    paths = [path]
+    while paths:
+      path = paths.pop()
+
+      brace_alternatives = None
+      if '{' in path:
+        brace_alternatives = self._GetBraceAlternatives(path)
+
+      if not brace_alternatives:
+        if len(expanded_paths) >= self._BRACE_EXPANSION_LIMIT:
+          logging.warning((
+              f'Brace expansion exceeds maximum number of paths, limiting '
+              f'to: {self._BRACE_EXPANSION_LIMIT:d}.'))
+          break
+
+        expanded_paths.append(path)
+        continue
+
+      start_index, end_index, alternatives = brace_alternatives
+      prefix = path[:start_index]
+      suffix = path[end_index + 1:]
+
+      # Add the alternatives in reverse order so that they are expanded in
+      # the order they are defined.
+      for alternative in reversed(alternatives):
+        paths.append(''.join([prefix, alternative, suffix]))
+
+    return expanded_paths
+
   def ExpandEnvironmentVariables(
       self, path, path_separator, environment_variables):
     """Expands environment variables.
@@ -242,8 +356,15 @@ class PathResolver(object):
       str: path with environment variables expanded.
     """
     path_segments = path.split(path_separator)
-    path_segments = self._ExpandEnvironmentVariablesInPathSegments(
-        path_segments, environment_variables)
+
+    # A path without a "%" contains no environment variables, but can still
+    # start with a Windows drive indicator.
+    if '%' in path:
+      path_segments = self._ExpandEnvironmentVariablesInPathSegments(
+          path_segments, environment_variables)
+    elif self._IsWindowsDrivePathSegment(path_segments[0]):
+      path_segments[0] = ''
+
     return path_separator.join(path_segments)
 
   def ExpandGlobStars(self, path, path_separator):
@@ -319,5 +440,9 @@ class PathResolver(object):
       list[str]: paths for which the users variables have been expanded.
     """
     path_segments = path.split(path_separator)
-    return self._ExpandUsersVariableInPathSegments(
+    expanded_paths = self._ExpandUsersVariableInPathSegments(
         path_segments, path_separator, user_accounts)
+
+    # User accounts can share a user directory, hence duplicate paths are
+    # removed while preserving their order.
+    return list(dict.fromkeys(expanded_paths))
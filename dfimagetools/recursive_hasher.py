@@ -12,7 +12,7 @@ class RecursiveHasher(object):
   """Recursively calculates message digest hashes of data streams."""
 
   # Class constant that defines the default read buffer size.
-  _READ_BUFFER_SIZE = 16 * 1024 * 1024
+  _READ_BUFFER_SIZE = 1024 * 1024
 
   # List of tuple that contain:
   #    tuple: full path represented as a tuple of path segments
@@ -20,6 +20,11 @@ class RecursiveHasher(object):
   _PATHS_TO_IGNORE = frozenset([
       (('$BadClus', ), '$Bad')])
 
+  # Names of the data streams in _PATHS_TO_IGNORE, to only look up the full
+  # path of data streams that can be ignored.
+  _DATA_STREAM_NAMES_TO_IGNORE = frozenset(
+      data_stream_name for _, data_stream_name in _PATHS_TO_IGNORE)
+
   def _CalculateHashDataStream(self, file_entry, data_stream_name):
     """Calculates a message digest hash of the data of the file entry.
 
@@ -75,18 +80,18 @@ class RecursiveHasher(object):
     Returns:
       str: path to display.
     """
-    display_path = ''
-
-    path_segments = [
-        segment.translate(definitions.NON_PRINTABLE_CHARACTER_TRANSLATION_TABLE)
-        for segment in path_segments]
-    display_path = ''.join([display_path, '/'.join(path_segments)])
+    display_path = '/'.join(path_segments)
 
     if data_stream_name:
-      data_stream_name = data_stream_name.translate(
-          definitions.NON_PRINTABLE_CHARACTER_TRANSLATION_TABLE)
       display_path = ':'.join([display_path, data_stream_name])
 
+    # All characters in the translation table are non-printable and "/" and
+    # ":" are not escaped, hence the path only needs to be translated once
+    # and only if it contains a non-printable character.
+    if not display_path.isprintable():
+      display_path = display_path.translate(
+          definitions.NON_PRINTABLE_CHARACTER_TRANSLATION_TABLE)
+
     return display_path or '/'
 
   def CalculateHashesFileEntry(self, file_entry, path_segments):
@@ -99,12 +104,17 @@ class RecursiveHasher(object):
     Yields:
       tuple[str, str]: display path and hash value.
     """
-    lookup_path = tuple(path_segments[1:])
-
     for data_stream in file_entry.data_streams:
+      data_stream_name = data_stream.name
+
+      ignore_data_stream = False
+      if data_stream_name in self._DATA_STREAM_NAMES_TO_IGNORE:
+        lookup_key = (tuple(path_segments[1:]), data_stream_name)
+        ignore_data_stream = lookup_key in self._PATHS_TO_IGNORE
+
       hash_value = None
-      if (lookup_path, data_stream.name) not in self._PATHS_TO_IGNORE:
-        hash_value = self._CalculateHashDataStream(file_entry, data_stream.name)
+      if not ignore_data_stream:
+        hash_value = self._CalculateHashDataStream(file_entry, data_stream_name)
 
-      display_path = self._GetDisplayPath(path_segments, data_stream.name)
+      display_path = self._GetDisplayPath(path_segments, data_stream_name)
       yield display_path, hash_value
@@ -13,6 +13,8 @@ class EnvironmentVariable(object):
         "/home/user".
   """
 
+  __slots__ = ('case_sensitive', 'name', 'value')
+
   def __init__(self, case_sensitive=True, name=None, value=None):
     """Initializes an environment variable.
 
@@ -41,6 +43,10 @@ class UserAccount(object):
     username (str): name uniquely identifying the user.
   """
 
+  __slots__ = (
+      'full_name', 'group_identifier', 'identifier', 'user_directory',
+      'user_directory_path_separator', 'username')
+
   def __init__(
       self, full_name=None, group_identifier=None, identifier=None,
       user_directory=None, user_directory_path_separator='/', username=None):
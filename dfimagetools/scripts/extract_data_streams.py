@@ -7,11 +7,6 @@ import logging
 import os
 import sys
 
-import artifacts
-
-from artifacts import reader as artifacts_reader
-from artifacts import registry as artifacts_registry
-
 from dfvfs.lib import errors as dfvfs_errors
 
 from dfimagetools import artifact_filters
@@ -19,6 +14,7 @@ from dfimagetools import data_stream_writer
 from dfimagetools import file_entry_lister
 from dfimagetools import path_filters
 from dfimagetools import windows_registry
+from dfimagetools.helpers import artifacts as artifacts_helper
 from dfimagetools.helpers import command_line
 
 
@@ -87,12 +83,8 @@ def Main():
   if options.artifact_filters:
     artifact_definitions = options.artifact_definitions
     if not artifact_definitions:
-      artifact_definitions = os.path.join(
-          os.path.dirname(artifacts.__file__), 'data')
-      if not os.path.exists(artifact_definitions):
-        artifact_definitions = os.path.join('/', 'usr', 'share', 'artifacts')
-      if not os.path.exists(artifact_definitions):
-        artifact_definitions = None
+      artifact_definitions = (
+          artifacts_helper.GetDefaultArtifactDefinitionsPath())
 
     if (not artifact_definitions and
         not options.custom_artifact_definitions):
@@ -126,25 +118,16 @@ def Main():
       command_line.ParseStorageMediaImageCLIArguments(options))
 
   if options.artifact_filters:
-    registry = artifacts_registry.ArtifactDefinitionsRegistry()
-    reader = artifacts_reader.YamlArtifactsReader()
-
-    if artifact_definitions:
-      if os.path.isdir(artifact_definitions):
-        registry.ReadFromDirectory(reader, artifact_definitions)
-      elif os.path.isfile(artifact_definitions):
-        registry.ReadFromFile(reader, artifact_definitions)
-
-    if options.custom_artifact_definitions:
-      if os.path.isdir(options.custom_artifact_definitions):
-        registry.ReadFromDirectory(
-            reader, options.custom_artifact_definitions)
-      elif os.path.isfile(options.custom_artifact_definitions):
-        registry.ReadFromFile(reader, options.custom_artifact_definitions)
+    registry = artifacts_helper.ReadArtifactDefinitionsRegistry(
+        artifact_definitions, options.custom_artifact_definitions)
 
     filter_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
         registry)
 
+    names = tuple(
+        name.strip() for name in options.artifact_filters.split(',')
+        if name.strip())
+
   elif options.path_filter:
     filter_generator = path_filters.PathFiltersGenerator(options.path_filter)
 
@@ -168,6 +151,12 @@ def Main():
       print('')
       return 1
 
+    # Destination directories that have been created, used to prevent
+    # creating the same directory for every data stream.
+    created_directories = set()
+
+    stream_writer = data_stream_writer.DataStreamWriter()
+
     for base_path_spec in base_path_specs:
       find_specs = []
 
@@ -185,7 +174,6 @@ def Main():
 
         # TODO: determine user accounts.
 
-        names = options.artifact_filters.split(',')
         find_specs = list(filter_generator.GetFindSpecs(
             names=names, environment_variables=environment_variables,
             user_accounts=user_accounts))
@@ -202,7 +190,6 @@ def Main():
       file_entries_generator = entry_lister.ListFileEntriesWithFindSpecs(
           [base_path_spec], find_specs)
 
-      stream_writer = data_stream_writer.DataStreamWriter()
       for file_entry, path_segments in file_entries_generator:
         for data_stream in file_entry.data_streams:
           display_path = stream_writer.GetDisplayPath(
@@ -212,7 +199,9 @@ def Main():
           logging.info(f'Extracting: {display_path:s} to: {destination_path:s}')
 
           destination_directory = os.path.dirname(destination_path)
-          os.makedirs(destination_directory, exist_ok=True)
+          if destination_directory not in created_directories:
+            os.makedirs(destination_directory, exist_ok=True)
+            created_directories.add(destination_directory)
 
           stream_writer.WriteDataStream(
               file_entry, data_stream.name, destination_path)
@@ -4,20 +4,15 @@
 
 import argparse
 import logging
-import os
 import sys
 
-import artifacts
-
-from artifacts import reader as artifacts_reader
-from artifacts import registry as artifacts_registry
-
 from dfvfs.lib import errors as dfvfs_errors
 
 from dfimagetools import artifact_filters
 from dfimagetools import bodyfile
 from dfimagetools import file_entry_lister
 from dfimagetools import windows_registry
+from dfimagetools.helpers import artifacts as artifacts_helper
 from dfimagetools.helpers import command_line
 
 
@@ -88,12 +83,8 @@ def Main():
   if options.artifact_filters:
     artifact_definitions = options.artifact_definitions
     if not artifact_definitions:
-      artifact_definitions = os.path.join(
-          os.path.dirname(artifacts.__file__), 'data')
-      if not os.path.exists(artifact_definitions):
-        artifact_definitions = os.path.join('/', 'usr', 'share', 'artifacts')
-      if not os.path.exists(artifact_definitions):
-        artifact_definitions = None
+      artifact_definitions = (
+          artifacts_helper.GetDefaultArtifactDefinitionsPath())
 
     if (not artifact_definitions and
         not options.custom_artifact_definitions):
@@ -108,21 +99,19 @@ def Main():
   mediator, volume_scanner_options = (
       command_line.ParseStorageMediaImageCLIArguments(options))
 
+  filter_generator = None
+  names = ()
+
   if options.artifact_filters:
-    registry = artifacts_registry.ArtifactDefinitionsRegistry()
-    reader = artifacts_reader.YamlArtifactsReader()
+    registry = artifacts_helper.ReadArtifactDefinitionsRegistry(
+        artifact_definitions, options.custom_artifact_definitions)
 
-    if artifact_definitions:
-      if os.path.isdir(artifact_definitions):
-        registry.ReadFromDirectory(reader, artifact_definitions)
-      elif os.path.isfile(artifact_definitions):
-        registry.ReadFromFile(reader, artifact_definitions)
+    filter_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
+        registry)
 
-    if options.custom_artifact_definitions:
-      if os.path.isdir(options.custom_artifact_definitions):
-        registry.ReadFromDirectory(reader, options.custom_artifact_definitions)
-      elif os.path.isfile(options.custom_artifact_definitions):
-        registry.ReadFromFile(reader, options.custom_artifact_definitions)
+    names = tuple(
+        name.strip() for name in options.artifact_filters.split(',')
+        if name.strip())
 
   entry_lister = file_entry_lister.FileEntryLister(
       mediator=mediator, use_aliases=options.use_aliases)
@@ -136,47 +125,47 @@ def Main():
       print('')
       return 1
 
+    bodyfile_generator = bodyfile.BodyfileGenerator()
     bodyfile_header_printed = False
 
-    for base_path_spec in base_path_specs:
-      if not options.artifact_filters:
-        find_specs = []
-      else:
-        windows_directory = entry_lister.GetWindowsDirectory(base_path_spec)
-        if not windows_directory:
-          environment_variables = []
+    with command_line.OpenBufferedStdout() as output_writer:
+      for base_path_spec in base_path_specs:
+        if not options.artifact_filters:
+          find_specs = []
         else:
-          winregistry_collector = windows_registry.WindowsRegistryCollector(
-              base_path_spec, windows_directory)
-
-          environment_variables = (
-              winregistry_collector.CollectSystemEnvironmentVariables())
-
-        filter_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
-            registry, environment_variables, [])
-
-        names = options.artifact_filters.split(',')
-        find_specs = list(filter_generator.GetFindSpecs(names))
-        if not find_specs:
-          continue
-
-        find_specs_generated = True
-
-      if find_specs:
-        file_entries_generator = entry_lister.ListFileEntriesWithFindSpecs(
-            [base_path_spec], find_specs)
-      else:
-        file_entries_generator = entry_lister.ListFileEntries([base_path_spec])
+          windows_directory = entry_lister.GetWindowsDirectory(base_path_spec)
+          if not windows_directory:
+            environment_variables = []
+          else:
+            winregistry_collector = windows_registry.WindowsRegistryCollector(
+                base_path_spec, windows_directory)
+
+            environment_variables = (
+                winregistry_collector.CollectSystemEnvironmentVariables())
+
+          find_specs = list(filter_generator.GetFindSpecs(
+              names=names, environment_variables=environment_variables,
+              user_accounts=[]))
+          if not find_specs:
+            continue
+
+          find_specs_generated = True
+
+        if find_specs:
+          file_entries_generator = entry_lister.ListFileEntriesWithFindSpecs(
+              [base_path_spec], find_specs)
+        else:
+          file_entries_generator = entry_lister.ListFileEntries(
+              [base_path_spec])
 
-      if not bodyfile_header_printed:
-        print('# extended bodyfile 3 format')
-        bodyfile_header_printed = True
+        if not bodyfile_header_printed:
+          output_writer.write('# extended bodyfile 3 format\n')
+          bodyfile_header_printed = True
 
-      bodyfile_generator = bodyfile.BodyfileGenerator()
-      for file_entry, path_segments in file_entries_generator:
-        for bodyfile_entry in bodyfile_generator.GetEntries(
-            file_entry, path_segments):
-          print(bodyfile_entry)
+        for file_entry, path_segments in file_entries_generator:
+          for bodyfile_entry in bodyfile_generator.GetEntries(
+              file_entry, path_segments):
+            output_writer.write(''.join([bodyfile_entry, '\n']))
 
   except dfvfs_errors.ScannerError as exception:
     print(f'[ERROR] {exception!s}', file=sys.stderr)
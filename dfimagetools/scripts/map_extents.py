@@ -57,32 +57,39 @@ def Main():
 
     # TODO: error if not a storage media image or device
 
-    print('Start offset\tEnd offset\tExtent type\tPath hint')
-
-    for file_entry, path_segments in entry_lister.ListFileEntries(
-        base_path_specs):
-
-      path = '/'.join(path_segments) or '/'
-
-      for data_stream in file_entry.data_streams:
-        # Ignore the WofCompressedData data stream since the NTFS back-end
-        # has built-in support for Windows Overlay Filter (WOF) compression.
-        if (data_stream.name == 'WofCompressedData' and
-            file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_NTFS):
-          continue
-
-        if data_stream.name:
-          extent_type = 'DATA_STREAM'
-          data_stream_path = ':'.join([path, data_stream.name])
-        else:
-          extent_type = 'FILE_CONTENT'
-          data_stream_path = path
-
-        for extent in data_stream.GetExtents():
-          if extent.extent_type != dfvfs_definitions.EXTENT_TYPE_SPARSE:
-            extent_end_offset = extent.offset + extent.size
-            print(f'0x{extent.offset:08x}\t0x{extent_end_offset:08x}\t'
-                  f'{extent_type:s}\t{data_stream_path:s}')
+    with command_line.OpenBufferedStdout() as output_writer:
+      output_writer.write('Start offset\tEnd offset\tExtent type\tPath hint\n')
+
+      for file_entry, path_segments in entry_lister.ListFileEntries(
+          base_path_specs):
+
+        path = '/'.join(path_segments) or '/'
+
+        for data_stream in file_entry.data_streams:
+          # Ignore the WofCompressedData data stream since the NTFS back-end
+          # has built-in support for Windows Overlay Filter (WOF) compression.
+          if (data_stream.name == 'WofCompressedData' and
+              file_entry.type_indicator == (
+                  dfvfs_definitions.TYPE_INDICATOR_NTFS)):
+            continue
+
+          if data_stream.name:
+            extent_type = 'DATA_STREAM'
+            data_stream_path = ':'.join([path, data_stream.name])
+          else:
+            extent_type = 'FILE_CONTENT'
+            data_stream_path = path
+
+          # The extent type and path are the same for all extents of the data
+          # stream.
+          extent_values = f'{extent_type:s}\t{data_stream_path:s}'
+
+          for extent in data_stream.GetExtents():
+            if extent.extent_type != dfvfs_definitions.EXTENT_TYPE_SPARSE:
+              extent_end_offset = extent.offset + extent.size
+              output_writer.write((
+                  f'0x{extent.offset:08x}\t0x{extent_end_offset:08x}\t'
+                  f'{extent_values:s}\n'))
 
   except dfvfs_errors.ScannerError as exception:
     print(f'[ERROR] {exception!s}', file=sys.stderr)
@@ -13,13 +13,55 @@ from dfimagetools import resources
 from tests import test_lib
 
 
+class GlobSetTest(test_lib.BaseTestCase):
+  """Tests for the glob set."""
+
+  def testMatchPath(self):
+    """Tests the MatchPath function."""
+    test_glob_set = artifact_filters.GlobSet([
+        ('\\Windows\\test_data\\*.evtx', '\\'),
+        ('/home/*/.bash_history', '/'),
+        ('/etc/passwd?', '/')])
+
+    self.assertEqual(test_glob_set.MatchPath('/Windows/test_data/a.evtx'), 0)
+    self.assertEqual(test_glob_set.MatchPath('/WINDOWS/Test_Data/A.EVTX'), 0)
+    self.assertEqual(test_glob_set.MatchPath('/home/user/.bash_history'), 1)
+    self.assertEqual(test_glob_set.MatchPath('/etc/passwd-'), 2)
+
+    self.assertIsNone(test_glob_set.MatchPath('/Windows/test_data/a/b.evtx'))
+    self.assertIsNone(test_glob_set.MatchPath('/etc/passwd'))
+
+    test_glob_set = artifact_filters.GlobSet(
+        [('/etc/[!p]asswd', '/')], case_sensitive=True)
+
+    self.assertEqual(test_glob_set.MatchPath('/etc/Passwd'), 0)
+    self.assertIsNone(test_glob_set.MatchPath('/etc/passwd'))
+    self.assertIsNone(test_glob_set.MatchPath('/ETC/Passwd'))
+
+    # Test a character group without closing bracket.
+    test_glob_set = artifact_filters.GlobSet([('/etc/[!]x', '/')])
+
+    self.assertEqual(test_glob_set.MatchPath('/etc/[!]x'), 0)
+
+    # Test that a path glob that cannot be converted is skipped.
+    test_glob_set = artifact_filters.GlobSet([
+        ('/etc/[z-a]', '/'),
+        ('/etc/passwd', '/')])
+
+    self.assertEqual(test_glob_set.MatchPath('/etc/passwd'), 1)
+    self.assertIsNone(test_glob_set.MatchPath('/etc/z'))
+
+    test_glob_set = artifact_filters.GlobSet([])
+    self.assertIsNone(test_glob_set.MatchPath('/etc/passwd'))
+
+
 class ArtifactDefinitionFiltersGeneratorTest(test_lib.BaseTestCase):
   """Tests for the artifact definition filters generator."""
 
   # pylint: disable=protected-access
 
-  def testBuildFindSpecsFromArtifactDefinition(self):
-    """Tests the _BuildFindSpecsFromArtifactDefinition function."""
+  def testBuildFindSpecsFromArtifactDefinitions(self):
+    """Tests the _BuildFindSpecsFromArtifactDefinitions function."""
     registry = artifacts_registry.ArtifactDefinitionsRegistry()
     reader = artifacts_reader.YamlArtifactsReader()
 
@@ -35,8 +77,8 @@ class ArtifactDefinitionFiltersGeneratorTest(test_lib.BaseTestCase):
         case_sensitive=False, name='%SystemRoot%', value='C:\\Windows')]
 
     # Test file artifact definition type.
-    find_specs = list(test_generator._BuildFindSpecsFromArtifactDefinition(
-        'TestFile2', environment_variables=environment_variables))
+    find_specs = list(test_generator._BuildFindSpecsFromArtifactDefinitions(
+        ['TestFile2'], environment_variables=environment_variables))
 
     self.assertEqual(len(find_specs), 1)
 
@@ -49,59 +91,54 @@ class ArtifactDefinitionFiltersGeneratorTest(test_lib.BaseTestCase):
         find_specs[0]._location_segments, expected_location_segments)
 
     # Test group artifact definition type.
-    find_specs = list(test_generator._BuildFindSpecsFromArtifactDefinition(
-        'TestGroup1', environment_variables=environment_variables))
+    find_specs = list(test_generator._BuildFindSpecsFromArtifactDefinitions(
+        ['TestGroup1'], environment_variables=environment_variables))
 
     self.assertEqual(len(find_specs), 4)
 
-  def testBuildFindSpecsFromFileSourcePath(self):
-    """Tests the _BuildFindSpecsFromFileSourcePath function."""
-    registry = artifacts_registry.ArtifactDefinitionsRegistry()
-    reader = artifacts_reader.YamlArtifactsReader()
-
-    test_artifacts_path = self._GetTestFilePath(['artifacts'])
-    self._SkipIfPathNotExists(test_artifacts_path)
+    # Artifact definitions should only be processed once.
+    find_specs = list(test_generator._BuildFindSpecsFromArtifactDefinitions(
+        ['TestGroup1', 'TestFile2'],
+        environment_variables=environment_variables))
 
-    registry.ReadFromDirectory(reader, test_artifacts_path)
+    self.assertEqual(len(find_specs), 4)
 
+  def testExpandFileSourcePath(self):
+    """Tests the _ExpandFileSourcePath function."""
+    registry = artifacts_registry.ArtifactDefinitionsRegistry()
     test_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
         registry)
 
     environment_variables = [resources.EnvironmentVariable(
         case_sensitive=False, name='%SystemRoot%', value='C:\\Windows')]
 
-    # Test expansion of environment variables.
-    find_specs = list(test_generator._BuildFindSpecsFromFileSourcePath(
-        '%%environ_systemroot%%\\test_data\\*.evtx', '\\',
-        environment_variables=environment_variables))
+    expanded_paths = test_generator._ExpandFileSourcePath(
+        '%%environ_systemroot%%\\{a,b}.evtx', '\\',
+        environment_variables=environment_variables)
+    self.assertEqual(
+        expanded_paths, ['\\Windows\\a.evtx', '\\Windows\\b.evtx'])
 
-    self.assertEqual(len(find_specs), 1)
+    lookup_key = ('%%environ_systemroot%%\\{a,b}.evtx', '\\')
+    self.assertIn(lookup_key, test_generator._expanded_paths_cache)
 
-    # Location segments should be equivalent to \Windows\test_data\*.evtx.
-    # Underscores are not escaped in regular expressions in supported versions
-    # of Python 3. See https://bugs.python.org/issue2650.
-    expected_location_segments = ['Windows', 'test_data', '.*\\.evtx']
+    cached_expanded_paths = test_generator._ExpandFileSourcePath(
+        '%%environ_systemroot%%\\{a,b}.evtx', '\\',
+        environment_variables=environment_variables)
+    self.assertIs(cached_expanded_paths, expanded_paths)
 
-    self.assertEqual(
-        find_specs[0]._location_segments, expected_location_segments)
+    # Test expansion of environment variables.
+    expanded_paths = test_generator._ExpandFileSourcePath(
+        '%%environ_systemroot%%\\test_data\\*.evtx', '\\',
+        environment_variables=environment_variables)
+    self.assertEqual(expanded_paths, ['\\Windows\\test_data\\*.evtx'])
 
     # Test expansion of globs.
-    find_specs = list(test_generator._BuildFindSpecsFromFileSourcePath(
-        '\\test_data\\**', '\\'))
+    expanded_paths = test_generator._ExpandFileSourcePath(
+        '\\test_data\\**', '\\')
 
     # Glob expansion should by default recurse ten levels.
-    self.assertEqual(len(find_specs), 10)
-
-    # Last entry in find_specs list should be 10 levels of depth.
-    # Underscores are not escaped in regular expressions in supported versions
-    # of Python 3. See https://bugs.python.org/issue2650
-    expected_location_segments = ['test_data']
-
-    expected_location_segments.extend([
-        '.*', '.*', '.*', '.*', '.*', '.*', '.*', '.*', '.*', '.*'])
-
-    self.assertEqual(
-        find_specs[9]._location_segments, expected_location_segments)
+    self.assertEqual(len(expanded_paths), 10)
+    self.assertEqual(expanded_paths[9], ''.join(['\\test_data', '\\*' * 10]))
 
     # Test expansion of user home directories
     test_user1 = resources.UserAccount(
@@ -109,18 +146,16 @@ class ArtifactDefinitionFiltersGeneratorTest(test_lib.BaseTestCase):
     test_user2 = resources.UserAccount(
         user_directory='/home/testuser2', username='testuser2')
 
-    find_specs = list(test_generator._BuildFindSpecsFromFileSourcePath(
+    test_generator._ResetCachesOnContextChange(None, [test_user1, test_user2])
+    expanded_paths = test_generator._ExpandFileSourcePath(
         '%%users.homedir%%/.thumbnails/**3', '/',
-        user_accounts=[test_user1, test_user2]))
+        user_accounts=[test_user1, test_user2])
 
-    # 6 find specs should be created for testuser1 and testuser2.
-    self.assertEqual(len(find_specs), 6)
+    # 6 paths should be expanded for testuser1 and testuser2.
+    self.assertEqual(len(expanded_paths), 6)
 
-    # Last entry in find_specs list should be testuser2 with a depth of 3
-    expected_location_segments = [
-        'home', 'testuser2', '\\.thumbnails', '.*', '.*', '.*']
-    self.assertEqual(
-        find_specs[5]._location_segments, expected_location_segments)
+    # Last expanded path should be testuser2 with a depth of 3
+    self.assertEqual(expanded_paths[5], '/home/testuser2/.thumbnails/*/*/*')
 
     # Test Windows path with profile directories and globs with a depth of 4.
     test_user1 = resources.UserAccount(
@@ -130,32 +165,163 @@ class ArtifactDefinitionFiltersGeneratorTest(test_lib.BaseTestCase):
         user_directory='%SystemDrive%\\Users\\testuser2',
         user_directory_path_separator='\\', username='testuser2')
 
-    find_specs = list(test_generator._BuildFindSpecsFromFileSourcePath(
+    test_generator._ResetCachesOnContextChange(None, [test_user1, test_user2])
+    expanded_paths = test_generator._ExpandFileSourcePath(
         '%%users.userprofile%%\\AppData\\**4', '\\',
-        user_accounts=[test_user1, test_user2]))
+        user_accounts=[test_user1, test_user2])
 
-    # 8 find specs should be created for testuser1 and testuser2.
-    self.assertEqual(len(find_specs), 8)
+    # 8 paths should be expanded for testuser1 and testuser2.
+    self.assertEqual(len(expanded_paths), 8)
 
-    # Last entry in find_specs list should be testuser2, with a depth of 4.
-    expected_location_segments = [
-        'Users', 'testuser2', 'AppData', '.*', '.*', '.*', '.*']
+    # Last expanded path should be testuser2, with a depth of 4.
     self.assertEqual(
-        find_specs[7]._location_segments, expected_location_segments)
+        expanded_paths[7], '\\Users\\testuser2\\AppData\\*\\*\\*\\*')
 
-    find_specs = list(test_generator._BuildFindSpecsFromFileSourcePath(
+    expanded_paths = test_generator._ExpandFileSourcePath(
         '%%users.localappdata%%\\Microsoft\\**4', '\\',
-        user_accounts=[test_user1, test_user2]))
+        user_accounts=[test_user1, test_user2])
+
+    # 16 paths should be expanded for testuser1 and testuser2.
+    self.assertEqual(len(expanded_paths), 16)
+
+    # Last expanded path should be testuser2, with a depth of 4.
+    self.assertEqual(expanded_paths[15], (
+        '\\Users\\testuser2\\Local Settings\\Application Data\\'
+        'Microsoft\\*\\*\\*\\*'))
+
+  def testGetDefinition(self):
+    """Tests the _GetDefinition function."""
+    registry = artifacts_registry.ArtifactDefinitionsRegistry()
+    reader = artifacts_reader.YamlArtifactsReader()
+
+    test_artifacts_path = self._GetTestFilePath(['artifacts'])
+    self._SkipIfPathNotExists(test_artifacts_path)
+
+    registry.ReadFromDirectory(reader, test_artifacts_path)
+
+    test_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
+        registry)
+
+    definition = test_generator._GetDefinition('TestFile2')
+    self.assertIsNotNone(definition)
+    self.assertEqual(definition.name, 'TestFile2')
+    self.assertIn('TestFile2', test_generator._definitions_cache)
+
+    definition = test_generator._GetDefinition('Bogus')
+    self.assertIsNone(definition)
+    self.assertIn('Bogus', test_generator._definitions_cache)
+
+  def testGetPathGlobsFromArtifactDefinition(self):
+    """Tests the _GetPathGlobsFromArtifactDefinition function."""
+    registry = artifacts_registry.ArtifactDefinitionsRegistry()
+    reader = artifacts_reader.YamlArtifactsReader()
 
-    # 16 find specs should be created for testuser1 and testuser2.
-    self.assertEqual(len(find_specs), 16)
+    test_artifacts_path = self._GetTestFilePath(['artifacts'])
+    self._SkipIfPathNotExists(test_artifacts_path)
+
+    registry.ReadFromDirectory(reader, test_artifacts_path)
+
+    test_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
+        registry)
+
+    environment_variables = [resources.EnvironmentVariable(
+        case_sensitive=False, name='%SystemRoot%', value='C:\\Windows')]
+
+    # Test file artifact definition type.
+    path_globs, group_names = (
+        test_generator._GetPathGlobsFromArtifactDefinition(
+            'TestFile2', environment_variables=environment_variables))
+
+    self.assertEqual(path_globs, [('\\Windows\\test_data\\*.evtx', '\\')])
+    self.assertEqual(group_names, ())
+
+    # Test group artifact definition type.
+    path_globs, group_names = (
+        test_generator._GetPathGlobsFromArtifactDefinition(
+            'TestGroup1', environment_variables=environment_variables))
+
+    self.assertEqual(path_globs, [])
+    self.assertEqual(group_names, ('TestFile1', 'TestFile2'))
+
+  def testGetPathGlobsFromArtifactDefinitions(self):
+    """Tests the _GetPathGlobsFromArtifactDefinitions function."""
+    registry = artifacts_registry.ArtifactDefinitionsRegistry()
+    reader = artifacts_reader.YamlArtifactsReader()
 
-    # Last entry in find_specs list should be testuser2, with a depth of 4.
-    expected_location_segments = [
-        'Users', 'testuser2', 'Local\\ Settings', 'Application\\ Data',
-        'Microsoft', '.*', '.*', '.*', '.*']
+    test_artifacts_path = self._GetTestFilePath(['artifacts'])
+    self._SkipIfPathNotExists(test_artifacts_path)
+
+    registry.ReadFromDirectory(reader, test_artifacts_path)
+
+    test_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
+        registry)
+
+    environment_variables = [resources.EnvironmentVariable(
+        case_sensitive=False, name='%SystemRoot%', value='C:\\Windows')]
+
+    path_globs = list(test_generator._GetPathGlobsFromArtifactDefinitions(
+        ['TestGroup1'], environment_variables=environment_variables))
+
+    self.assertEqual(len(path_globs), 4)
+    self.assertEqual(
+        path_globs[-1], ('\\Windows\\test_data\\*.evtx', '\\'))
+
+    # Test artifact groups that include each other.
+    path_globs = list(test_generator._GetPathGlobsFromArtifactDefinitions(
+        ['TestGroup2'], environment_variables=environment_variables))
+
+    self.assertEqual(path_globs, [('\\Windows\\test_data\\*.evtx', '\\')])
+
+  def testGetUniqueSourceValues(self):
+    """Tests the _GetUniqueSourceValues function."""
+    registry = artifacts_registry.ArtifactDefinitionsRegistry()
+    reader = artifacts_reader.YamlArtifactsReader()
+
+    test_artifacts_path = self._GetTestFilePath(['artifacts'])
+    self._SkipIfPathNotExists(test_artifacts_path)
+
+    registry.ReadFromDirectory(reader, test_artifacts_path)
+
+    test_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
+        registry)
+
+    definition = registry.GetDefinitionByName('TestFile2')
+    source = definition.sources[0]
+
+    unique_values = test_generator._GetUniqueSourceValues(source, 'paths')
     self.assertEqual(
-        find_specs[15]._location_segments, expected_location_segments)
+        unique_values, ('%%environ_systemroot%%\\test_data\\*.evtx', ))
+
+    # Another attribute of the same source should not return cached values.
+    unique_values = test_generator._GetUniqueSourceValues(source, 'names')
+    self.assertEqual(unique_values, ())
+
+  def testResetCachesOnContextChange(self):
+    """Tests the _ResetCachesOnContextChange function."""
+    registry = artifacts_registry.ArtifactDefinitionsRegistry()
+    test_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
+        registry)
+
+    environment_variables = [resources.EnvironmentVariable(
+        case_sensitive=False, name='%SystemRoot%', value='C:\\Windows')]
+
+    test_generator._ResetCachesOnContextChange(environment_variables, [])
+    test_generator._ExpandFileSourcePath(
+        '%%environ_systemroot%%\\test.evtx', '\\',
+        environment_variables=environment_variables)
+    self.assertEqual(len(test_generator._expanded_paths_cache), 1)
+
+    # The same expansion context should keep the caches.
+    test_generator._ResetCachesOnContextChange(environment_variables, [])
+    self.assertEqual(len(test_generator._expanded_paths_cache), 1)
+
+    # A change of the same list of environment variables should reset the
+    # caches.
+    environment_variables.append(resources.EnvironmentVariable(
+        case_sensitive=False, name='%ProgramData%', value='C:\\ProgramData'))
+
+    test_generator._ResetCachesOnContextChange(environment_variables, [])
+    self.assertEqual(len(test_generator._expanded_paths_cache), 0)
 
   def testGetFindSpecs(self):
     """Tests the GetFindSpecs function."""
@@ -186,6 +352,68 @@ class ArtifactDefinitionFiltersGeneratorTest(test_lib.BaseTestCase):
     self.assertEqual(
         find_specs[0]._location_segments, expected_location_segments)
 
+    # A change of the same list of environment variables should be used.
+    environment_variables[0] = resources.EnvironmentVariable(
+        case_sensitive=False, name='%SystemRoot%', value='C:\\WinNT')
+
+    find_specs = list(test_generator.GetFindSpecs(
+        names=['TestFile2'], environment_variables=environment_variables))
+
+    self.assertEqual(len(find_specs), 1)
+
+    expected_location_segments = ['WinNT', 'test_data', '.*\\.evtx']
+
+    self.assertEqual(
+        find_specs[0]._location_segments, expected_location_segments)
+
+  def testGetGlobSet(self):
+    """Tests the GetGlobSet function."""
+    registry = artifacts_registry.ArtifactDefinitionsRegistry()
+    reader = artifacts_reader.YamlArtifactsReader()
+
+    test_artifacts_path = self._GetTestFilePath(['artifacts'])
+    self._SkipIfPathNotExists(test_artifacts_path)
+
+    registry.ReadFromDirectory(reader, test_artifacts_path)
+
+    test_generator = artifact_filters.ArtifactDefinitionFiltersGenerator(
+        registry)
+
+    environment_variables = [resources.EnvironmentVariable(
+        case_sensitive=False, name='%SystemRoot%', value='C:\\Windows')]
+
+    glob_set = test_generator.GetGlobSet(
+        names=['TestGroup1'], environment_variables=environment_variables)
+
+    self.assertEqual(len(glob_set.path_globs), 4)
+
+    match_index = glob_set.MatchPath('/Windows/test_data/System.evtx')
+    self.assertIsNotNone(match_index)
+    self.assertEqual(
+        glob_set.path_globs[match_index],
+        ('\\Windows\\test_data\\*.evtx', '\\'))
+
+    match_index = glob_set.MatchPath('/home/user/AUTHORS')
+    self.assertIsNotNone(match_index)
+    self.assertEqual(
+        glob_set.path_globs[match_index], ('/home/*/AUTHORS', '/'))
+
+    self.assertIsNone(glob_set.MatchPath('/home/user/README'))
+
+    # Test artifact groups that include each other.
+    glob_set = test_generator.GetGlobSet(
+        names=['TestGroup2'], environment_variables=environment_variables)
+
+    self.assertEqual(
+        glob_set.path_globs, [('\\Windows\\test_data\\*.evtx', '\\')])
+
+    # Test an artifact definition included by multiple artifact groups.
+    glob_set = test_generator.GetGlobSet(
+        names=['TestGroup1', 'TestGroup3'],
+        environment_variables=environment_variables)
+
+    self.assertEqual(len(glob_set.path_globs), 4)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -4,6 +4,8 @@
 
 import unittest
 
+from dfdatetime import filetime as dfdatetime_filetime
+
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.resolver import resolver
 from dfvfs.path import factory as path_spec_factory
@@ -29,6 +31,9 @@ class BodyfileGeneratorTest(test_lib.BaseTestCase):
     mode_string = test_bodyfile_generator._GetModeString(0o777)
     self.assertEqual(mode_string, '-rwxrwxrwx')
 
+    mode_string = test_bodyfile_generator._GetModeString(0o40751)
+    self.assertEqual(mode_string, 'drwxr-x--x')
+
     mode_string = test_bodyfile_generator._GetModeString(0x1000)
     self.assertEqual(mode_string, 'p---------')
 
@@ -47,6 +52,38 @@ class BodyfileGeneratorTest(test_lib.BaseTestCase):
     mode_string = test_bodyfile_generator._GetModeString(0xc000)
     self.assertEqual(mode_string, 's---------')
 
+  def testGetPath(self):
+    """Tests the _GetPath function."""
+    test_bodyfile_generator = bodyfile.BodyfileGenerator()
+
+    path = test_bodyfile_generator._GetPath(['', 'a/b', 'c|d', 'e\\f'])
+    self.assertEqual(path, '/a\\/b/c\\|d/e\\\\f')
+
+    path = test_bodyfile_generator._GetPath(['', 'a\x00b', 'c'])
+    self.assertEqual(path, '/a\\x00b/c')
+
+    path = test_bodyfile_generator._GetPath([''])
+    self.assertEqual(path, '')
+
+  def testGetTimestamp(self):
+    """Tests the _GetTimestamp function."""
+    test_bodyfile_generator = bodyfile.BodyfileGenerator()
+
+    timestamp = test_bodyfile_generator._GetTimestamp(None)
+    self.assertEqual(timestamp, '')
+
+    date_time = dfdatetime_filetime.Filetime(timestamp=0x01cb3a623d0a17ce)
+
+    timestamp = test_bodyfile_generator._GetTimestamp(date_time)
+    self.assertEqual(timestamp, '1281647191.5468750')
+    self.assertEqual(len(test_bodyfile_generator._timestamps_cache), 1)
+
+    date_time = dfdatetime_filetime.Filetime(timestamp=0x01cb3a623d0a17ce)
+
+    timestamp = test_bodyfile_generator._GetTimestamp(date_time)
+    self.assertEqual(timestamp, '1281647191.5468750')
+    self.assertEqual(len(test_bodyfile_generator._timestamps_cache), 1)
+
   def testGetEntries(self):
     """Tests the GetEntries function."""
     path = self._GetTestFilePath(['image.qcow2'])
@@ -60,12 +97,10 @@ class BodyfileGeneratorTest(test_lib.BaseTestCase):
         dfvfs_definitions.TYPE_INDICATOR_TSK, location='/passwords.txt',
         parent=path_spec)
 
-    file_system = resolver.Resolver.OpenFileSystem(path_spec)
     file_entry = resolver.Resolver.OpenFileEntry(path_spec)
 
     test_lister = file_entry_lister.FileEntryLister()
-    file_entries = list(test_lister._ListFileEntry(
-        file_system, file_entry, ['']))
+    file_entries = list(test_lister._ListFileEntry(file_entry, ['']))
 
     self.assertEqual(len(file_entries), 1)
 
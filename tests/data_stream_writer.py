@@ -28,6 +28,18 @@ class DataStreamWriterTest(test_lib.BaseTestCase):
       b'uber secret laire,admin,admin',
       b''])
 
+  def testSanitizePathSegment(self):
+    """Tests the _SanitizePathSegment function."""
+    test_data_stream_writer = data_stream_writer.DataStreamWriter()
+
+    path_segment = test_data_stream_writer._SanitizePathSegment(
+        'pass:words?.txt')
+    self.assertEqual(path_segment, 'pass_words_.txt')
+
+    path_segment = test_data_stream_writer._SanitizePathSegment(
+        'pass\u2028w\x00rds.txt')
+    self.assertEqual(path_segment, 'pass_w_rds.txt')
+
   def testGetDisplayPath(self):
     """Tests the GetDisplayPath function."""
     test_data_stream_writer = data_stream_writer.DataStreamWriter()
@@ -57,12 +69,10 @@ class DataStreamWriterTest(test_lib.BaseTestCase):
         dfvfs_definitions.TYPE_INDICATOR_TSK, location='/passwords.txt',
         parent=path_spec)
 
-    file_system = resolver.Resolver.OpenFileSystem(path_spec)
     file_entry = resolver.Resolver.OpenFileEntry(path_spec)
 
     test_lister = file_entry_lister.FileEntryLister()
-    file_entries = list(test_lister._ListFileEntry(
-        file_system, file_entry, ['']))
+    file_entries = list(test_lister._ListFileEntry(file_entry, ['']))
 
     self.assertEqual(len(file_entries), 1)
 
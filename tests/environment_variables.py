@@ -57,6 +57,55 @@ class WindowsEnvironmentVariablesCollectorTest(shared_test_lib.BaseTestCase):
     self.assertEqual(environment_variable.name, '%TEMP%')
     self.assertEqual(environment_variable.value, '%SystemRoot%\\TEMP')
 
+  def testCollectWithSoftwareKeys(self):
+    """Tests the Collect function with software Registry keys."""
+    key_path_prefix = 'HKEY_LOCAL_MACHINE\\Software'
+
+    registry_file = dfwinreg_fake.FakeWinRegistryFile(
+        key_path_prefix=key_path_prefix)
+
+    registry_key = dfwinreg_fake.FakeWinRegistryKey('ProfileList')
+    registry_file.AddKeyByPath(
+        '\\Microsoft\\Windows NT\\CurrentVersion', registry_key)
+
+    value_data = 'C:\\ProgramData'.encode('utf-16-le')
+    registry_value = dfwinreg_fake.FakeWinRegistryValue(
+        'ProgramData', data=value_data, data_type=dfwinreg_definitions.REG_SZ)
+    registry_key.AddValue(registry_value)
+
+    registry_key = dfwinreg_fake.FakeWinRegistryKey('CurrentVersion')
+    registry_file.AddKeyByPath('\\Microsoft\\Windows', registry_key)
+
+    value_data = 'C:\\Program Files'.encode('utf-16-le')
+    registry_value = dfwinreg_fake.FakeWinRegistryValue(
+        'ProgramFilesDir', data=value_data,
+        data_type=dfwinreg_definitions.REG_SZ)
+    registry_key.AddValue(registry_value)
+
+    registry_key = registry_file.GetKeyByPath(
+        '\\Microsoft\\Windows NT\\CurrentVersion')
+
+    value_data = 'C:\\Windows'.encode('utf-16-le')
+    registry_value = dfwinreg_fake.FakeWinRegistryValue(
+        'SystemRoot', data=value_data, data_type=dfwinreg_definitions.REG_SZ)
+    registry_key.AddValue(registry_value)
+
+    registry_file.Open(None)
+
+    registry = dfwinreg_registry.WinRegistry()
+    registry.MapFile(key_path_prefix, registry_file)
+
+    collector_object = (
+        environment_variables.WindowsEnvironmentVariablesCollector())
+
+    test_results = [
+        (environment_variable.name, environment_variable.value)
+        for environment_variable in collector_object.Collect(registry)]
+    self.assertEqual(test_results, [
+        ('%ProgramData%', 'C:\\ProgramData'),
+        ('%ProgramFiles%', 'C:\\Program Files'),
+        ('%SystemRoot%', 'C:\\Windows')])
+
   def testCollectEmpty(self):
     """Tests the Collect function on an empty Registry."""
     registry = dfwinreg_registry.WinRegistry()
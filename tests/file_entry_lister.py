@@ -18,6 +18,46 @@ class FileEntryListerTest(test_lib.BaseTestCase):
 
   # pylint: disable=protected-access
 
+  def testGetBasePathSegment(self):
+    """Tests the _GetBasePathSegment function."""
+    test_lister = file_entry_lister.FileEntryLister()
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/image.raw')
+
+    path_segment = test_lister._GetBasePathSegment(path_spec)
+    self.assertIsNone(path_segment)
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK_PARTITION, location='/p1',
+        parent=path_spec)
+
+    path_segment = test_lister._GetBasePathSegment(path_spec)
+    self.assertEqual(path_segment, 'p1')
+
+  def testGetBasePathSegments(self):
+    """Tests the _GetBasePathSegments function."""
+    test_lister = file_entry_lister.FileEntryLister()
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/image.raw')
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK_PARTITION, location='/p1',
+        parent=path_spec)
+
+    path_segments = test_lister._GetBasePathSegments(path_spec)
+    self.assertEqual(path_segments, ['', 'p1'])
+    self.assertIn(path_spec.comparable, test_lister._base_path_segments_cache)
+
+    # Changes to the returned path segments should not affect the cache.
+    path_segments.append('bogus')
+
+    path_segments = test_lister._GetBasePathSegments(path_spec)
+    self.assertEqual(path_segments, ['', 'p1'])
+
+    path_segments = test_lister._GetBasePathSegments(None)
+    self.assertEqual(path_segments, [''])
+
   def testListFileEntry(self):
     """Tests the _ListFileEntry function."""
     path = self._GetTestFilePath(['image.qcow2'])
@@ -33,11 +73,9 @@ class FileEntryListerTest(test_lib.BaseTestCase):
         dfvfs_definitions.TYPE_INDICATOR_TSK, location='/passwords.txt',
         parent=path_spec)
 
-    file_system = resolver.Resolver.OpenFileSystem(path_spec)
     file_entry = resolver.Resolver.OpenFileEntry(path_spec)
 
-    file_entries = list(test_lister._ListFileEntry(
-        file_system, file_entry, ['']))
+    file_entries = list(test_lister._ListFileEntry(file_entry, ['']))
 
     self.assertEqual(len(file_entries), 1)
 
@@ -73,6 +73,11 @@ class PathResolverTest(test_lib.BaseTestCase):
         ['%%environ_systemroot%%', 'System32'], environment_variables)
     self.assertEqual(path_segments, ['', 'Windows', 'System32'])
 
+    path_segments = test_resolver._ExpandEnvironmentVariablesInPathSegments(
+        ['%SystemRoot%', 'System32', '%SystemRoot%'], environment_variables)
+    self.assertEqual(path_segments, [
+        '', 'Windows', 'System32', 'C:', 'Windows'])
+
     # Test non-string environment variable.
     environment_variables = []
 
@@ -178,6 +183,54 @@ class PathResolverTest(test_lib.BaseTestCase):
     expected_expanded_paths = ['\\Windows']
     self.assertEqual(sorted(expanded_paths), expected_expanded_paths)
 
+  def testGetBraceAlternatives(self):
+    """Tests the _GetBraceAlternatives function."""
+    test_resolver = path_resolver.PathResolver()
+
+    brace_alternatives = test_resolver._GetBraceAlternatives('/a/{b,c}/d')
+    self.assertEqual(brace_alternatives, (3, 7, ['b', 'c']))
+
+    brace_alternatives = test_resolver._GetBraceAlternatives('/{a,{b,c}}')
+    self.assertEqual(brace_alternatives, (1, 9, ['a', '{b,c}']))
+
+    brace_alternatives = test_resolver._GetBraceAlternatives('/{GUID}')
+    self.assertIsNone(brace_alternatives)
+
+    brace_alternatives = test_resolver._GetBraceAlternatives('/{a,b')
+    self.assertIsNone(brace_alternatives)
+
+  def testGetEnvironmentVariablesLookupTable(self):
+    """Tests the _GetEnvironmentVariablesLookupTable function."""
+    test_resolver = path_resolver.PathResolver()
+
+    environment_variable = resources.EnvironmentVariable(
+        case_sensitive=False, name='SystemRoot', value='C:\\Windows')
+    environment_variables = [environment_variable]
+
+    lookup_table = test_resolver._GetEnvironmentVariablesLookupTable(
+        environment_variables)
+    self.assertEqual(lookup_table, {'SYSTEMROOT': 'C:\\Windows'})
+
+    cached_lookup_table = test_resolver._GetEnvironmentVariablesLookupTable(
+        environment_variables)
+    self.assertIs(cached_lookup_table, lookup_table)
+
+    # A change of the same list of environment variables should update the
+    # lookup table.
+    environment_variable = resources.EnvironmentVariable(
+        case_sensitive=False, name='ProgramData', value='C:\\ProgramData')
+    environment_variables.append(environment_variable)
+
+    lookup_table = test_resolver._GetEnvironmentVariablesLookupTable(
+        environment_variables)
+    self.assertEqual(lookup_table, {
+        'ALLUSERSAPPDATA': 'C:\\ProgramData',
+        'PROGRAMDATA': 'C:\\ProgramData',
+        'SYSTEMROOT': 'C:\\Windows'})
+
+    lookup_table = test_resolver._GetEnvironmentVariablesLookupTable([])
+    self.assertEqual(lookup_table, {})
+
   def testIsWindowsDrivePathSegment(self):
     """Tests the _IsWindowsDrivePathSegment function."""
     test_resolver = path_resolver.PathResolver()
@@ -194,6 +247,34 @@ class PathResolverTest(test_lib.BaseTestCase):
     result = test_resolver._IsWindowsDrivePathSegment('Windows')
     self.assertFalse(result)
 
+  def testExpandBraces(self):
+    """Tests the ExpandBraces function."""
+    test_resolver = path_resolver.PathResolver()
+
+    paths = test_resolver.ExpandBraces('\\Windows\\{System32,SysWOW64}')
+    self.assertEqual(paths, [
+        '\\Windows\\System32', '\\Windows\\SysWOW64'])
+
+    paths = test_resolver.ExpandBraces('/{a,b}/{c,d}')
+    self.assertEqual(paths, ['/a/c', '/a/d', '/b/c', '/b/d'])
+
+    paths = test_resolver.ExpandBraces('/{a,{b,c}}')
+    self.assertEqual(paths, ['/a', '/b', '/c'])
+
+    paths = test_resolver.ExpandBraces('/{,a}b')
+    self.assertEqual(paths, ['/b', '/ab'])
+
+    # Braces without a comma are not expanded.
+    paths = test_resolver.ExpandBraces('/Users/{GUID}/file.txt')
+    self.assertEqual(paths, ['/Users/{GUID}/file.txt'])
+
+    # Unmatched braces are not expanded.
+    paths = test_resolver.ExpandBraces('/{a,b')
+    self.assertEqual(paths, ['/{a,b'])
+
+    paths = test_resolver.ExpandBraces('/{0,1}' * 11)
+    self.assertEqual(len(paths), test_resolver._BRACE_EXPANSION_LIMIT)
+
   def testExpandEnvironmentVariables(self):
     """Tests the ExpandEnvironmentVariables function."""
     test_resolver = path_resolver.PathResolver()
@@ -208,6 +289,14 @@ class PathResolverTest(test_lib.BaseTestCase):
         '%SystemRoot%\\System32', '\\', environment_variables)
     self.assertEqual(expanded_path, '\\Windows\\System32')
 
+    environment_variable = resources.EnvironmentVariable(
+        case_sensitive=False, name='ProgramData', value='C:\\ProgramData')
+    environment_variables.append(environment_variable)
+
+    expanded_path = test_resolver.ExpandEnvironmentVariables(
+        '%ProgramData%\\x', '\\', environment_variables)
+    self.assertEqual(expanded_path, '\\ProgramData\\x')
+
   def testExpandGlobStars(self):
     """Tests the ExpandGlobStars function."""
     test_resolver = path_resolver.PathResolver()
@@ -297,6 +386,21 @@ class PathResolverTest(test_lib.BaseTestCase):
         '\\Users\\Test2\\Application Data\\Microsoft\\Windows\\Recent']
     self.assertEqual(sorted(expanded_paths), expected_expanded_paths)
 
+    # Test user accounts that share a user directory.
+    user_account_artifact3 = resources.UserAccount(
+        user_directory='C:\\Users\\Test1', user_directory_path_separator='\\',
+        username='Test3')
+
+    user_accounts = [user_account_artifact1, user_account_artifact3]
+
+    expanded_paths = test_resolver.ExpandUsersVariable(
+        path, '\\', user_accounts)
+
+    expected_expanded_paths = [
+        '\\Users\\Test1\\AppData\\Roaming\\Microsoft\\Windows\\Recent',
+        '\\Users\\Test1\\Application Data\\Microsoft\\Windows\\Recent']
+    self.assertEqual(sorted(expanded_paths), expected_expanded_paths)
+
 
 if __name__ == '__main__':
   unittest.main()